@@ -10,12 +10,11 @@
 # and this post: https://github.com/jbarlow83/OCRmyPDF/issues/8
 ###############################################################################
 import argparse
-import configparser
 import datetime
 import errno
+import functools
 import glob
-import io
-import itertools
+import json
 import math
 import multiprocessing
 import os
@@ -28,33 +27,255 @@ import string
 import subprocess
 import sys
 import tempfile
+import threading
 import time
 from collections import namedtuple
 from concurrent import futures
-from pathlib import Path
-from xml.etree import ElementTree
 
 import PyPDF2
+import numpy as np
+import pdf2pdfocr_multibackground
 import psutil
-from PIL import Image, ImageChops
+from PIL import Image
 from PyPDF2.errors import PdfReadError
 from PyPDF2.generic import ByteStringObject
-from bs4 import BeautifulSoup
+from lxml import etree as lxml_etree
+from lxml import html as lxml_html
 from packaging.version import parse as parse_version
 from reportlab.lib.units import inch
+from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfgen.canvas import Canvas
 
+try:
+    import pikepdf
+except ImportError:
+    pikepdf = None  # Optional (libqpdf based). PyPDF2 fallbacks are used when not installed
+# libgomp reads OMP_THREAD_LIMIT when libtesseract loads, and pool workers inherit it on
+# fork - so the limit must be in the environment before the import, or in-process OCR runs
+# one OpenMP team per worker on top of one worker per core. Tool subprocesses get the same
+# limit via CHILD_ENV below. setdefault keeps an explicit user choice untouched.
+os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None  # Optional (libtesseract based). The tesseract binary is forked per page when not installed
+
+try:
+    import _rl_accel  # noqa: F401 - only probing for reportlab's C accelerator
+    rl_accel_available = True
+except ImportError:
+    rl_accel_available = False
+
 __author__ = 'Leonardo F. Cardoso'
 
 VERSION = '1.12.2 marapurense '
 
+PDFTOPPM_FORMAT_FLAGS = {"jpg": "-jpeg", "png": "-png", "tif": "-tiff"}
+"""Map temp image extension to the matching pdftoppm output format flag"""
+
+BBOX_PATTERN = re.compile(r'bbox\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)')
+"""Extract the four hOCR bounding box coordinates in a single match"""
+
+LIGATURE_TABLE = str.maketrans({u"ﬂ": "fl", u"ﬁ": "fi"})
+"""Map ligatures to plain letter pairs in one str.translate pass per word"""
+
+OSD_ROTATE_PATTERN = re.compile(r'^Rotate:\s*(-?\d+)', re.MULTILINE)
+"""Extract the rotation angle from a tesseract OSD file"""
+
+
+def get_log_sink(param_verbose_mode, param_log_path):
+    """
+    Return an output sink for worker subprocess calls. Most of the per-page log
+    files stay empty, so they are only created in verbose mode - otherwise the
+    output is dropped, avoiding two file creates per subprocess launch.
+    """
+    if param_verbose_mode:
+        return open(param_log_path, "wb")
+    return subprocess.DEVNULL
+
+_font_width_luts = {}
+"""Per-font numpy lookup tables with character advance widths (per 1000 units of font size)"""
+
+
+def get_font_width_lut(fontname):
+    """
+    Return a 256-entry numpy array with the advance width of each latin-1 char
+    for the given font, or None when the font metrics are not available.
+    Used to compute word widths with one vectorized sum instead of the
+    per-character Python loop inside reportlab's stringWidth.
+    """
+    if fontname not in _font_width_luts:
+        try:
+            _font_width_luts[fontname] = np.array(pdfmetrics.getFont(fontname).widths, dtype=np.int32)
+        except Exception:
+            _font_width_luts[fontname] = None
+    return _font_width_luts[fontname]
+
+
+PROBE_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "pdf2pdfocr", "probes.json")
+"""On-disk cache of tool capability probes, so repeated runs skip the probe forks entirely"""
+
+_probe_cache_data = None
+"""Lazily loaded content of PROBE_CACHE_FILE"""
+
+
+def _probe_cache_key(param_tool_path, param_probe_name):
+    """Key a probe by tool path, probe name, and the executable's mtime/size - a tool upgrade invalidates its entries"""
+    tool_stat = os.stat(param_tool_path)
+    return "{0}|{1}|{2}|{3}".format(param_tool_path, param_probe_name, tool_stat.st_mtime_ns, tool_stat.st_size)
+
+
+def get_cached_probe(param_tool_path, param_probe_name):
+    """Read a probe result from the on-disk cache. Returns None on miss or any cache problem."""
+    global _probe_cache_data
+    try:
+        if _probe_cache_data is None:
+            with open(PROBE_CACHE_FILE, "r") as cache_file:
+                _probe_cache_data = json.load(cache_file)
+        return _probe_cache_data.get(_probe_cache_key(param_tool_path, param_probe_name))
+    except (OSError, ValueError):
+        _probe_cache_data = {}
+        return None
+
+
+def set_cached_probe(param_tool_path, param_probe_name, param_value):
+    """Store a probe result in the on-disk cache. Best effort - a read-only home directory is not an error."""
+    global _probe_cache_data
+    if _probe_cache_data is None:
+        _probe_cache_data = {}
+    try:
+        _probe_cache_data[_probe_cache_key(param_tool_path, param_probe_name)] = param_value
+        os.makedirs(os.path.dirname(PROBE_CACHE_FILE), exist_ok=True)
+        with open(PROBE_CACHE_FILE, "w") as cache_file:
+            json.dump(_probe_cache_data, cache_file)
+    except OSError:
+        pass
+
+
+CHILD_ENV = {**os.environ, "OMP_THREAD_LIMIT": os.environ.get("OMP_THREAD_LIMIT", "1"),
+             "MAGICK_THREAD_LIMIT": os.environ.get("MAGICK_THREAD_LIMIT", "1")}
+"""Environment for tesseract/ImageMagick children, built once at import. With one worker per
+core their own OpenMP threads only cause contention - see the note in __main__. An explicit
+user setting in the parent environment wins. Passing env= per spawn keeps the parent
+process environment unmutated."""
+
+CONVERT_PRESETS = {
+    "fast": "-threshold 60% -compress Group4",
+    "best": "-colors 2 -colorspace gray -normalize -threshold 60% -compress Group4",
+    "grayscale": "-threshold 85% -morphology Dilate Diamond -compress Group4",
+    "jpeg": "-strip -interlace Plane -gaussian-blur 0.05 -quality 50% -compress JPEG",
+    "jpeg2000": "-quality 32% -compress JPEG2000",
+}
+"""Named '-g' presets for the final PDF rebuild with ImageMagick convert
+Please read http://www.imagemagick.org/Usage/quantize/#colors_two"""
+
+PRINTABLE_FILTER_PATTERN = re.compile(r'[^\x20-\x7e]+')
+"""Anything outside printable ASCII, stripped from recovered metadata strings in one C-level pass"""
+
+TOOL_VERSION_PATTERN = re.compile(rb'(\d+)\.(\d+)\.(\d+)')
+"""First dotted version number in a tool's --version output, matched on raw bytes"""
+
+
+def get_tool_version(param_tool_path, param_version_flag):
+    """
+    Run an external tool with its version flag and parse the first x.y.z number
+    straight from the output bytes (no decode/split dance). Raises on any failure -
+    callers keep their own legacy version fallbacks.
+    """
+    version_output = subprocess.check_output([param_tool_path, param_version_flag], stderr=subprocess.STDOUT)
+    version_match = TOOL_VERSION_PATTERN.search(version_output)
+    if version_match is None:
+        raise ValueError("No version number found in output of {0}".format(param_tool_path))
+    return parse_version(b".".join(version_match.groups()).decode("ascii"))
+
 
 def eprint(*args, **kwargs):
     print(*args, file=sys.stderr, flush=True, **kwargs)
 
 
+_worker_config = {}
+"""Per-process invariant configuration, populated by pool_worker_init in each pool worker"""
+
+_worker_progress = None
+"""Shared OCR progress counter, populated by pool_worker_init in each pool worker"""
+
+_worker_tesserocr_api = None
+"""Per-process persistent tesserocr API, created once per worker by get_tesserocr_api"""
+
+
+def get_tesserocr_api(param_tess_lang, param_tess_psm):
+    """
+    Create (once per worker process) and reuse the in-process tesseract API, so the
+    language model load is paid per worker instead of per page. Returns None when
+    tesserocr is not installed or could not be initialized.
+    """
+    global _worker_tesserocr_api
+    if tesserocr is None:
+        return None
+    if _worker_tesserocr_api is None:
+        try:
+            _worker_tesserocr_api = tesserocr.PyTessBaseAPI(lang=param_tess_lang, psm=int(param_tess_psm))
+        except Exception as e:
+            eprint("Warning: tesserocr could not be initialized ({0}). Using the tesseract binary instead.".format(e))
+            _worker_tesserocr_api = False
+    return _worker_tesserocr_api or None
+
+
+def pool_worker_init(param_config, param_progress):
+    """
+    Pool initializer. Receives the invariant job configuration and the shared
+    progress counter once per worker process, so tasks only need to carry the
+    per-page image path instead of re-pickling paths, languages and flags for
+    every page.
+    """
+    global _worker_config, _worker_progress
+    _worker_config = param_config
+    _worker_progress = param_progress
+    # Warm PIL's lazy plugin registry once per worker instead of on the first
+    # Image.open of each process (module imports themselves are already
+    # inherited from the parent on fork, and paid once per worker on spawn).
+    Image.init()
+    # The "native" strategy can run tesseract in-process - load the language
+    # model now so the first OCR task of each worker does not absorb it
+    if param_config.get("text_generation_strategy") == "native" and param_config.get("extra_ocr_flag") is None:
+        get_tesserocr_api(param_config["tess_langs"], param_config["tess_psm"])
+
+
+def _track_progress():
+    """Increment the shared progress counter (replaces the old per-page .tmp marker files)"""
+    if _worker_progress is not None:
+        with _worker_progress.get_lock():
+            _worker_progress.value += 1
+
+
+def do_ocr_tesseract_task(param_image_file):
+    """Unary adapter for do_ocr_tesseract reading invariants from the worker configuration"""
+    cfg = _worker_config
+    do_ocr_tesseract(param_image_file, cfg["extra_ocr_flag"], cfg["tess_langs"], cfg["tess_psm"], cfg["tmp_dir"],
+                     cfg["path_tesseract"], cfg["text_generation_strategy"], cfg["delete_temps"], cfg["tesseract_can_textonly_pdf"],
+                     cfg["verbose_mode"])
+    _track_progress()
+
+
+def do_ocr_tesseract_batch_task(param_shard):
+    """Adapter for do_ocr_tesseract_batch reading invariants from the worker configuration"""
+    cfg = _worker_config
+    shard_id, image_file_list = param_shard
+    do_ocr_tesseract_batch(image_file_list, shard_id, cfg["extra_ocr_flag"], cfg["tess_langs"], cfg["tess_psm"], cfg["tmp_dir"],
+                           cfg["path_tesseract"], cfg["path_qpdf"], cfg["verbose_mode"])
+    for _ in image_file_list:
+        _track_progress()
+
+
+def do_ocr_cuneiform_task(param_image_file):
+    """Unary adapter for do_ocr_cuneiform reading invariants from the worker configuration"""
+    cfg = _worker_config
+    do_ocr_cuneiform(param_image_file, cfg["extra_ocr_flag"], cfg["tess_langs"], cfg["tmp_dir"], cfg["path_cuneiform"], cfg["verbose_mode"])
+    _track_progress()
+
+
 def do_pdftoimage(param_path_pdftoppm, param_page_range, param_input_file, param_image_resolution, param_tmp_dir,
-                  param_prefix, param_shell_mode):
+                  param_prefix, param_image_extension, param_verbose_mode):
     """
     Will be called from multiprocessing, so no global variables are allowed.
     Convert PDF to image file.
@@ -67,47 +288,78 @@ def do_pdftoimage(param_path_pdftoppm, param_page_range, param_input_file, param
         last_page = param_page_range[1]
         command_line_list += ['-f', str(first_page), '-l', str(last_page)]
     #
-    command_line_list += ['-r', str(param_image_resolution), '-jpeg', param_input_file, param_tmp_dir + param_prefix]
+    command_line_list += ['-r', str(param_image_resolution), PDFTOPPM_FORMAT_FLAGS[param_image_extension],
+                          param_input_file, param_tmp_dir + param_prefix]
     pimage = subprocess.Popen(command_line_list, stdout=subprocess.DEVNULL,
-                              stderr=open(param_tmp_dir + "pdftoppm_err_{0}-{1}-{2}.log".format(param_prefix, first_page, last_page), "wb"),
-                              shell=param_shell_mode)
+                              stderr=get_log_sink(param_verbose_mode, param_tmp_dir + "pdftoppm_err_{0}-{1}-{2}.log".format(
+                                  param_prefix, first_page, last_page)))
     pimage.wait()
-    return pimage.returncode
+    # Report which page images this range produced, so the caller can stream them to the
+    # next stage while other ranges still render. The page number filter keeps files from
+    # concurrent (possibly still incomplete) ranges out of the answer.
+    created_images = []
+    if param_page_range is not None:
+        for image_file in glob.glob("{0}{1}*.{2}".format(param_tmp_dir, param_prefix, param_image_extension)):
+            try:
+                page_number = int(os.path.splitext(image_file)[0].rsplit("-", 1)[1])
+            except (IndexError, ValueError):
+                continue
+            if first_page <= page_number <= last_page:
+                created_images.append(image_file)
+        created_images.sort()
+    return pimage.returncode, created_images
 
 
-def do_autorotate_info(param_image_file, param_shell_mode, param_temp_dir, param_tess_lang, param_path_tesseract, param_tesseract_version):
+def do_autorotate_info(param_image_file, param_temp_dir, param_tess_lang, param_path_tesseract, param_tesseract_version, param_verbose_mode):
     """
     Will be called from multiprocessing, so no global variables are allowed.
     Do autorotate of images based on tesseract (execution with 'psm 0') information.
     """
     param_image_no_ext = os.path.splitext(os.path.basename(param_image_file))[0]
+    output_base = f"{param_temp_dir}{param_image_no_ext}"
     psm_parameter = "-psm" if (param_tesseract_version == 3) else "--psm"
     tess_command_line = [param_path_tesseract, '-l', "osd+" + param_tess_lang, psm_parameter, '0', param_image_file,
-                         param_temp_dir + param_image_no_ext]
+                         output_base]
     ptess1 = subprocess.Popen(tess_command_line,
-                              stdout=open(param_temp_dir + "autorot_tess_out_{0}.log".format(param_image_no_ext), "wb"),
-                              stderr=open(param_temp_dir + "autorot_tess_err_{0}.log".format(param_image_no_ext), "wb"),
-                              shell=param_shell_mode)
+                              stdout=get_log_sink(param_verbose_mode, f"{param_temp_dir}autorot_tess_out_{param_image_no_ext}.log"),
+                              stderr=get_log_sink(param_verbose_mode, f"{param_temp_dir}autorot_tess_err_{param_image_no_ext}.log"),
+                              env=CHILD_ENV)
     ptess1.wait()
 
 
-def do_deskew(param_image_file, param_threshold, param_shell_mode, param_path_mogrify):
+def do_deskew(param_image_file_list, param_threshold, param_path_mogrify):
     """
     Will be called from multiprocessing, so no global variables are allowed.
-    Do a deskew of image.
+    Do a deskew of a group of images with a single mogrify call (in place edit).
     """
-    pd = subprocess.Popen([param_path_mogrify, '-deskew', param_threshold, param_image_file], shell=param_shell_mode)
+    pd = subprocess.Popen([param_path_mogrify, '-deskew', param_threshold] + param_image_file_list, env=CHILD_ENV)
     pd.wait()
     return True
 
 
-def do_ocr_tesseract(param_image_file, param_extra_ocr_flag, param_tess_lang, param_tess_psm, param_temp_dir, param_shell_mode, param_path_tesseract,
-                     param_text_generation_strategy, param_delete_temps, param_tess_can_textonly_pdf):
+def do_ocr_tesseract(param_image_file, param_extra_ocr_flag, param_tess_lang, param_tess_psm, param_temp_dir, param_path_tesseract,
+                     param_text_generation_strategy, param_delete_temps, param_tess_can_textonly_pdf, param_verbose_mode):
     """
     Will be called from multiprocessing, so no global variables are allowed.
     Do OCR of image with tesseract
     """
     param_image_no_ext = os.path.splitext(os.path.basename(param_image_file))[0]
+    output_base = f"{param_temp_dir}{param_image_no_ext}"
+    if param_text_generation_strategy == "native" and param_extra_ocr_flag is None:
+        # In-process OCR with the per-worker persistent tesserocr API - no fork and no
+        # model reload per page. Extra user OCR flags cannot pass through the API, so
+        # that case keeps the command line path below.
+        tesserocr_api = get_tesserocr_api(param_tess_lang, param_tess_psm)
+        if tesserocr_api is not None:
+            tesserocr_api.SetImageFile(param_image_file)
+            with open(f"{output_base}.hocr", "wb") as hocr_out:
+                # GetHOCRText returns the page fragment only - wrap it so HocrTransform can parse it
+                hocr_out.write(b"<html><body>" + tesserocr_api.GetHOCRText(0).encode("utf-8") + b"</body></html>")
+            with open(f"{output_base}.txt", "w") as txt_out:
+                txt_out.write(tesserocr_api.GetUTF8Text())
+            hocr = HocrTransform(f"{output_base}.hocr", 300)
+            hocr.to_pdf(f"{output_base}.pdf", image_file_name=None, show_bounding_boxes=False, invisible_text=True)
+            return
     tess_command_line = [param_path_tesseract]
     if type(param_extra_ocr_flag) == str:
         tess_command_line.extend(param_extra_ocr_flag.split(" "))
@@ -123,133 +375,256 @@ def do_ocr_tesseract(param_image_file, param_extra_ocr_flag, param_tess_lang, pa
     tess_command_line += [
         '-c', 'tessedit_create_txt=1',
         '-c', 'tessedit_pageseg_mode=' + param_tess_psm,
-        param_image_file, param_temp_dir + param_image_no_ext]
+        param_image_file, output_base]
     pocr = subprocess.Popen(tess_command_line,
                             stdout=subprocess.DEVNULL,
-                            stderr=open(param_temp_dir + "tess_err_{0}.log".format(param_image_no_ext), "wb"),
-                            shell=param_shell_mode)
+                            stderr=get_log_sink(param_verbose_mode, f"{param_temp_dir}tess_err_{param_image_no_ext}.log"),
+                            env=CHILD_ENV)
     pocr.wait()
     if param_text_generation_strategy == "tesseract" and (not param_tess_can_textonly_pdf):
-        pdf_file = param_temp_dir + param_image_no_ext + ".pdf"
-        pdf_file_tmp = param_temp_dir + param_image_no_ext + ".tesspdf"
-        os.rename(pdf_file, pdf_file_tmp)
-        output_pdf = PyPDF2.PdfWriter()
-        desc_pdf_file_tmp = open(pdf_file_tmp, 'rb')
-        tess_pdf = PyPDF2.PdfReader(desc_pdf_file_tmp, strict=False)
-        for i in range(len(tess_pdf.pages)):
-            imagepage = tess_pdf.pages[i]
-            output_pdf.addPage(imagepage)
-        #
-        output_pdf.removeImages(ignoreByteStringObject=False)
-        out_page = output_pdf.getPage(0)  # Tesseract PDF is always one page in this software
-        # Hack to obtain smaller file (delete the image reference)
-        out_page["/Resources"][PyPDF2.generic.createStringObject("/XObject")] = PyPDF2.generic.ArrayObject()
-        out_page.compressContentStreams()
-        with open(pdf_file, 'wb') as f:
-            output_pdf.write(f)
-        desc_pdf_file_tmp.close()
+        pdf_file = f"{output_base}.pdf"
+        pdf_file_tmp = f"{output_base}.tesspdf"
+        os.replace(pdf_file, pdf_file_tmp)
+        if pikepdf is not None:
+            # libqpdf strips the image reference and recompresses streams in native code
+            with pikepdf.open(pdf_file_tmp) as tess_pdf:
+                out_page = tess_pdf.pages[0]  # Tesseract PDF is always one page in this software
+                # Hack to obtain smaller file (delete the image reference)
+                out_page.Resources.XObject = pikepdf.Dictionary()
+                tess_pdf.save(pdf_file, compress_streams=True)
+        else:
+            output_pdf = PyPDF2.PdfWriter()
+            desc_pdf_file_tmp = open(pdf_file_tmp, 'rb')
+            tess_pdf = PyPDF2.PdfReader(desc_pdf_file_tmp, strict=False)
+            for i in range(len(tess_pdf.pages)):
+                imagepage = tess_pdf.pages[i]
+                output_pdf.addPage(imagepage)
+            #
+            output_pdf.removeImages(ignoreByteStringObject=False)
+            out_page = output_pdf.getPage(0)  # Tesseract PDF is always one page in this software
+            # Hack to obtain smaller file (delete the image reference)
+            out_page["/Resources"][PyPDF2.generic.createStringObject("/XObject")] = PyPDF2.generic.ArrayObject()
+            out_page.compressContentStreams()
+            with open(pdf_file, 'wb') as f:
+                output_pdf.write(f)
+            desc_pdf_file_tmp.close()
         # Try to save some temp space as tesseract generate PDF with same size of image
         if param_delete_temps:
             os.remove(pdf_file_tmp)
     #
     if param_text_generation_strategy == "native":
-        hocr = HocrTransform(param_temp_dir + param_image_no_ext + ".hocr", 300)
-        hocr.to_pdf(param_temp_dir + param_image_no_ext + ".pdf", image_file_name=None, show_bounding_boxes=False,
+        hocr = HocrTransform(f"{output_base}.hocr", 300)
+        hocr.to_pdf(f"{output_base}.pdf", image_file_name=None, show_bounding_boxes=False,
                     invisible_text=True)
-    # Track progress in all situations
-    Path(param_temp_dir + param_image_no_ext + ".tmp").touch()  # .tmp files are used to track overall progress
 
 
-def do_ocr_cuneiform(param_image_file, param_extra_ocr_flag, param_cunei_lang, param_temp_dir, param_shell_mode, param_path_cunei):
+def do_ocr_tesseract_batch(param_image_file_list, param_shard_id, param_extra_ocr_flag, param_tess_lang, param_tess_psm, param_temp_dir,
+                           param_path_tesseract, param_path_qpdf, param_verbose_mode):
+    """
+    Will be called from multiprocessing, so no global variables are allowed.
+    Do OCR of a shard of images with a single tesseract invocation, using the
+    list-of-images input mode. This amortizes the engine/model load cost over
+    all pages in the shard. The multi-page result is split back into the
+    per-page PDF/TXT files the rest of the flow expects.
+    Only used with text generation strategy "tesseract" when 'textonly_pdf' is available.
+    """
+    list_file = f"{param_temp_dir}tesslist_{param_shard_id}.txt"
+    with open(list_file, "w") as f:
+        f.write("\n".join(param_image_file_list))
+    batch_base = f"{param_temp_dir}tessbatch_{param_shard_id}"
+    tess_command_line = [param_path_tesseract]
+    if type(param_extra_ocr_flag) == str:
+        tess_command_line.extend(param_extra_ocr_flag.split(" "))
+    tess_command_line.extend([
+        '-l', param_tess_lang,
+        '-c', 'tessedit_create_pdf=1',
+        '-c', 'textonly_pdf=1',
+        '-c', 'tessedit_create_txt=1',
+        '-c', 'tessedit_pageseg_mode=' + param_tess_psm,
+        list_file, batch_base])
+    pocr = subprocess.Popen(tess_command_line,
+                            stdout=subprocess.DEVNULL,
+                            stderr=get_log_sink(param_verbose_mode, f"{param_temp_dir}tess_err_batch_{param_shard_id}.log"),
+                            env=CHILD_ENV)
+    pocr.wait()
+    image_no_ext_list = [os.path.splitext(os.path.basename(x))[0] for x in param_image_file_list]
+    # Split the shard PDF into one text-only PDF per page, named after the source image
+    batch_pdf = f"{batch_base}.pdf"
+    if os.path.isfile(batch_pdf):
+        split_done = False
+        if param_path_qpdf is not None:
+            # qpdf splits in native code - much faster than PyPDF2 rewriting each page in Python
+            psplit = subprocess.Popen([param_path_qpdf, "--split-pages", batch_pdf, f"{batch_base}_split-%d.pdf"],
+                                      stdout=subprocess.DEVNULL,
+                                      stderr=get_log_sink(param_verbose_mode, f"{param_temp_dir}qpdf_split_err_{param_shard_id}.log"))
+            psplit.wait()
+            split_files = sorted(glob.glob(f"{batch_base}_split-*.pdf"))
+            if (psplit.returncode in [0, 3]) and (len(split_files) == len(image_no_ext_list)):  # 3 means warnings only
+                for split_file, image_no_ext in zip(split_files, image_no_ext_list):
+                    os.replace(split_file, f"{param_temp_dir}{image_no_ext}.pdf")
+                split_done = True
+        if not split_done:
+            with open(batch_pdf, 'rb') as f:
+                batch_reader = PyPDF2.PdfReader(f, strict=False)
+                for idx, image_no_ext in enumerate(image_no_ext_list):
+                    if idx >= len(batch_reader.pages):
+                        break
+                    page_writer = PyPDF2.PdfWriter()
+                    page_writer.addPage(batch_reader.pages[idx])
+                    with open(f"{param_temp_dir}{image_no_ext}.pdf", 'wb') as f_page:
+                        page_writer.write(f_page)
+    # Tesseract separates page texts with form feeds - split them into per-page TXT files
+    batch_txt = f"{batch_base}.txt"
+    if os.path.isfile(batch_txt):
+        with open(batch_txt, "r", errors="ignore") as f:
+            page_texts = f.read().split("\f")
+        if len(page_texts) < len(image_no_ext_list):
+            # Not expected - keep all recognized text on the first page instead of losing it
+            page_texts = ["".join(page_texts)] + [""] * (len(image_no_ext_list) - 1)
+        for idx, image_no_ext in enumerate(image_no_ext_list):
+            with open(f"{param_temp_dir}{image_no_ext}.txt", "w") as f_txt:
+                f_txt.write(page_texts[idx])
+
+
+def do_ocr_cuneiform(param_image_file, param_extra_ocr_flag, param_cunei_lang, param_temp_dir, param_path_cunei, param_verbose_mode):
     """
     Will be called from multiprocessing, so no global variables are allowed.
     Do OCR of image with cuneiform
     """
     param_image_no_ext = os.path.splitext(os.path.basename(param_image_file))[0]
+    output_base = f"{param_temp_dir}{param_image_no_ext}"
+    hocr_file = f"{output_base}.hocr"
     cunei_command_line = [param_path_cunei]
     if type(param_extra_ocr_flag) == str:
         cunei_command_line.extend(param_extra_ocr_flag.split(" "))
-    cunei_command_line.extend(['-l', param_cunei_lang.lower(), "-f", "hocr", "-o", param_temp_dir + param_image_no_ext + ".hocr", param_image_file])
+    cunei_command_line.extend(['-l', param_cunei_lang.lower(), "-f", "hocr", "-o", hocr_file, param_image_file])
     #
     pocr = subprocess.Popen(cunei_command_line,
-                            stdout=open(param_temp_dir + "cuneif_out_{0}.log".format(param_image_no_ext), "wb"),
-                            stderr=open(param_temp_dir + "cuneif_err_{0}.log".format(param_image_no_ext), "wb"),
-                            shell=param_shell_mode)
+                            stdout=get_log_sink(param_verbose_mode, f"{param_temp_dir}cuneif_out_{param_image_no_ext}.log"),
+                            stderr=get_log_sink(param_verbose_mode, f"{param_temp_dir}cuneif_err_{param_image_no_ext}.log"))
     pocr.wait()
     # Sometimes, cuneiform fails to OCR and expected HOCR file is missing. Experiments show that English can be used to try a workaround.
-    if not os.path.isfile(param_temp_dir + param_image_no_ext + ".hocr") and param_cunei_lang.lower() != "eng":
+    if not os.path.isfile(hocr_file) and param_cunei_lang.lower() != "eng":
         eprint("Warning: fail to OCR file '{0}'. Trying again with English language.".format(param_image_no_ext))
         cunei_command_line = [param_path_cunei]
         if type(param_extra_ocr_flag) == str:
             cunei_command_line.extend(param_extra_ocr_flag.split(" "))
-        cunei_command_line.extend(['-l', "eng", "-f", "hocr", "-o", param_temp_dir + param_image_no_ext + ".hocr", param_image_file])
+        cunei_command_line.extend(['-l', "eng", "-f", "hocr", "-o", hocr_file, param_image_file])
         pocr = subprocess.Popen(cunei_command_line,
-                                stdout=open(param_temp_dir + "cuneif_out_eng_{0}.log".format(param_image_no_ext), "wb"),
-                                stderr=open(param_temp_dir + "cuneif_err_eng_{0}.log".format(param_image_no_ext), "wb"),
-                                shell=param_shell_mode)
+                                stdout=get_log_sink(param_verbose_mode, f"{param_temp_dir}cuneif_out_eng_{param_image_no_ext}.log"),
+                                stderr=get_log_sink(param_verbose_mode, f"{param_temp_dir}cuneif_err_eng_{param_image_no_ext}.log"))
         pocr.wait()
     #
-    bs_parser = "lxml"
-    if os.path.isfile(param_temp_dir + param_image_no_ext + ".hocr"):
-        # Try to fix unclosed meta tags, as cuneiform HOCR may be not well-formed
-        with open(param_temp_dir + param_image_no_ext + ".hocr", "r") as fpr:
-            corrected_hocr = str(BeautifulSoup(fpr, bs_parser))
+    recovery_parser = lxml_html.HTMLParser(recover=True)
+    if os.path.isfile(hocr_file):
+        # Try to fix unclosed meta tags, as cuneiform HOCR may be not well-formed (repair runs in C via lxml recovery)
+        hocr_tree = lxml_html.parse(hocr_file, recovery_parser)
     else:
         eprint("Warning: fail to OCR file '{0}'. Page will not contain text.".format(param_image_no_ext))
         # TODO try to use the same size as original PDF page (bbox is hard coded by now to look like A4 page - portrait)
-        corrected_hocr = str(BeautifulSoup('<div class="ocr_page" id="page_1" title="image x; bbox 0 0 1700 2400">', bs_parser))
-    with open(param_temp_dir + param_image_no_ext + ".fixed.hocr", "w") as fpw:
-        fpw.write(corrected_hocr)
+        hocr_tree = lxml_html.fromstring('<div class="ocr_page" id="page_1" title="image x; bbox 0 0 1700 2400">',
+                                         parser=recovery_parser).getroottree()
+    with open(f"{output_base}.fixed.hocr", "wb") as fpw:
+        # XML serialization keeps the fixed file parseable by HocrTransform
+        fpw.write(lxml_etree.tostring(hocr_tree, method="xml"))
     #
-    hocr = HocrTransform(param_temp_dir + param_image_no_ext + ".fixed.hocr", 300)
-    hocr.to_pdf(param_temp_dir + param_image_no_ext + ".pdf", image_file_name=None, show_bounding_boxes=False, invisible_text=True)
-    # Track progress
-    Path(param_temp_dir + param_image_no_ext + ".tmp").touch()  # .tmp files are used to track overall progress
+    hocr = HocrTransform(f"{output_base}.fixed.hocr", 300)
+    hocr.to_pdf(f"{output_base}.pdf", image_file_name=None, show_bounding_boxes=False, invisible_text=True)
 
 
-def do_rebuild(param_image_file, param_path_convert, param_convert_params, param_tmp_dir, param_shell_mode):
+def do_rebuild(param_image_file_list, param_shard_id, param_prefix, param_path_convert, param_convert_params, param_tmp_dir,
+               param_verbose_mode):
     """
     Will be called from multiprocessing, so no global variables are allowed.
-    Create one PDF file from image file.
+    Create one multipage PDF file from a sorted group of image files. Convert accepts
+    many input images per call, so one invocation per group replaces one per image -
+    the group PDFs are concatenated afterwards by merge_pdf_files.
     """
-    param_image_no_ext = os.path.splitext(os.path.basename(param_image_file))[0]
     # http://stackoverflow.com/questions/79968/split-a-string-by-spaces-preserving-quoted-substrings-in-python
     convert_params_list = shlex.split(param_convert_params)
-    command_rebuild = [param_path_convert, param_image_file] + convert_params_list + [param_tmp_dir + "REBUILD_" + param_image_no_ext + ".pdf"]
+    output_pdf = "{0}REBUILD_{1}_shard-{2:09d}.pdf".format(param_tmp_dir, param_prefix, param_shard_id)
+    command_rebuild = [param_path_convert] + list(param_image_file_list) + convert_params_list + [output_pdf]
     prebuild = subprocess.Popen(
         command_rebuild,
-        stdout=open(param_tmp_dir + "convert_log_{0}.log".format(param_image_no_ext), "wb"),
-        stderr=open(param_tmp_dir + "convert_err_{0}.log".format(param_image_no_ext), "wb"),
-        shell=param_shell_mode)
+        stdout=get_log_sink(param_verbose_mode, f"{param_tmp_dir}convert_log_shard_{param_shard_id}.log"),
+        stderr=get_log_sink(param_verbose_mode, f"{param_tmp_dir}convert_err_shard_{param_shard_id}.log"),
+        env=CHILD_ENV)
     prebuild.wait()
 
 
-def do_check_img_greyscale(param_image_file):
+def do_pdftoppm_tesseract_pipe(param_page_number, param_input_file, param_image_resolution, param_path_pdftoppm,
+                               param_extra_ocr_flag, param_tess_lang, param_tess_psm, param_temp_dir, param_prefix,
+                               param_path_tesseract, param_verbose_mode):
     """
-    Inspired in code provided by karl-k:
-    https://stackoverflow.com/questions/23660929/how-to-check-whether-a-jpeg-image-is-color-or-gray-scale-using-only-python-stdli
-    Check if image is monochrome (1 channel or 3 identical channels)
+    Will be called from multiprocessing, so no global variables are allowed.
+    Render a single page with pdftoppm straight into tesseract's stdin, so the page
+    image never touches the disk. Produces the same per page text-only PDF and TXT
+    outputs as do_ocr_tesseract, named so the page order sorts correctly.
     """
-    im = Image.open(param_image_file).convert('RGB')
-    rgb = im.split()
-    if ImageChops.difference(rgb[0], rgb[1]).getextrema()[1] != 0:
-        return False
-    if ImageChops.difference(rgb[0], rgb[2]).getextrema()[1] != 0:
-        return False
-    #
-    return True
+    output_base = "{0}{1}-{2:09d}".format(param_temp_dir, param_prefix, param_page_number)
+    render_command_line = [param_path_pdftoppm, '-f', str(param_page_number), '-l', str(param_page_number),
+                           '-r', str(param_image_resolution), '-png', param_input_file, '-']
+    tess_command_line = [param_path_tesseract]
+    if type(param_extra_ocr_flag) == str:
+        tess_command_line.extend(param_extra_ocr_flag.split(" "))
+    tess_command_line.extend(['-l', param_tess_lang,
+                              '-c', 'tessedit_create_pdf=1',
+                              '-c', 'textonly_pdf=1',
+                              '-c', 'tessedit_create_txt=1',
+                              '-c', 'tessedit_pageseg_mode=' + param_tess_psm,
+                              '-', output_base])
+    prender = subprocess.Popen(render_command_line, stdout=subprocess.PIPE,
+                               stderr=get_log_sink(param_verbose_mode, f"{output_base}_pipe_render.log"))
+    pocr = subprocess.Popen(tess_command_line, stdin=prender.stdout, stdout=subprocess.DEVNULL,
+                            stderr=get_log_sink(param_verbose_mode, f"{output_base}_pipe_tess.log"), env=CHILD_ENV)
+    prender.stdout.close()  # Let pdftoppm receive SIGPIPE if tesseract exits early
+    pocr.wait()
+    prender.wait()
+    return pocr.returncode
 
 
-def do_check_img_colors_size(param_image_file):
+def do_probe_image(param_image_file):
     """
-    Inspired in code provided by Raffael:
+    Will be called from multiprocessing, so no global variables are allowed.
+    Probe an image with a single open/decode: greyscale check (inspired in code
+    provided by karl-k), single color check (inspired in code provided by
+    Raffael) and dimensions.
+    https://stackoverflow.com/questions/23660929/how-to-check-whether-a-jpeg-image-is-color-or-gray-scale-using-only-python-stdli
     https://stackoverflow.com/questions/14041562/python-pil-detect-if-an-image-is-completely-black-or-white
-    Check if image is single color
+    Returns (is_greyscale, colors, (width, height)).
     """
     im = Image.open(param_image_file)
-    colors = im.getcolors()
     width, height = im.size
-    return colors, (width, height)
+    # For JPEG sources, draft produces a cheap scaled decode reused by both checks below
+    im.draft('RGB', (512, 512))
+    # maxcolors=1 makes Pillow bail out as soon as a second color shows up, so
+    # non-blank pages cost only the pixels scanned until the first mismatch
+    colors = im.getcolors(maxcolors=1)
+    if im.mode in ('L', '1'):
+        is_greyscale = True  # Single channel images are greyscale by definition, no need to compare bands
+    else:
+        arr = np.asarray(im.convert('RGB'))
+        is_greyscale = not ((arr[..., 0] != arr[..., 1]).any() or (arr[..., 0] != arr[..., 2]).any())
+    return is_greyscale, colors, (width, height)
+
+
+def do_pre_ocr(param_image_file, param_temp_dir, param_tess_lang, param_path_tesseract, param_tesseract_version,
+               param_use_autorotate, param_deskew_threshold, param_path_mogrify, param_verbose_mode):
+    """
+    Will be called from multiprocessing, so no global variables are allowed.
+    Fused per page preprocessing: blank/color probe, then autorotate info and deskew when
+    enabled - one pool task per page instead of one per stage, and blank pages skip the
+    subprocess stages entirely. Returns the probe tuple (see do_probe_image).
+    """
+    probe_info = do_probe_image(param_image_file)
+    is_blank = probe_info[1] is not None  # getcolors(maxcolors=1) only returns a value for single color images
+    if not is_blank:
+        if param_use_autorotate:
+            do_autorotate_info(param_image_file, param_temp_dir, param_tess_lang, param_path_tesseract,
+                               param_tesseract_version, param_verbose_mode)
+        if param_deskew_threshold is not None:
+            do_deskew([param_image_file], param_deskew_threshold, param_path_mogrify)
+    return probe_info
 
 
 def do_create_blank_pdf(param_filename_pdf, param_dimensions, param_image_resolution):
@@ -261,7 +636,6 @@ def do_create_blank_pdf(param_filename_pdf, param_dimensions, param_image_resolu
     blank_output_pdf.addBlankPage(img_width_pt, img_height_pt)
     with open(param_filename_pdf, 'wb') as f:
         blank_output_pdf.write(f)
-        f.close()
 
 
 def percentual_float(x):
@@ -284,21 +658,30 @@ class HocrTransform:
     Adapted from https://github.com/jbarlow83/OCRmyPDF/blob/master/ocrmypdf/hocrtransform.py
     """
 
+    rl_accel_warned = False
+    """Warn only once about a missing reportlab C accelerator"""
+
     def __init__(self, hocr_file_name, dpi):
+        if not rl_accel_available and not HocrTransform.rl_accel_warned:
+            HocrTransform.rl_accel_warned = True
+            eprint("Warning: reportlab C accelerator (rl_accel) not available. Text generation can be slow.")
         self.rect = namedtuple('Rect', ['x1', 'y1', 'x2', 'y2'])
         self.dpi = dpi
-        self.boxPattern = re.compile(r'bbox((\s+\d+){4})')
-        self.hocr = ElementTree.parse(hocr_file_name)
-        # if the hOCR file has a namespace, ElementTree requires its use to
+        self.hocr = lxml_etree.parse(hocr_file_name)
+        # if the hOCR file has a namespace, the parser requires its use to
         # find elements
         matches = re.match(r'({.*})html', self.hocr.getroot().tag)
         self.xmlns = ''
         if matches:
             self.xmlns = matches.group(1)
+        # Build element paths once - they are used for every paragraph/word of every page
+        self._xpath_page = ".//%sdiv[@class='ocr_page']" % self.xmlns
+        self._xpath_par = ".//%sp[@class='ocr_par']" % self.xmlns
+        self._xpath_word = ".//%sspan[@class='ocrx_word']" % self.xmlns
+        self._xpath_line = ".//%sspan[@class='ocr_line']" % self.xmlns
         # get dimension in pt (not pixel!!!!) of the OCRed image
         self.width, self.height = None, None
-        for div in self.hocr.findall(
-                ".//%sdiv[@class='ocr_page']" % self.xmlns):
+        for div in self.hocr.iterfind(self._xpath_page):
             coords = self.element_coordinates(div)
             pt_coords = self.pt_from_pixel(coords)
             self.width = pt_coords.x2 - pt_coords.x1
@@ -324,11 +707,8 @@ class HocrTransform:
         """
         Return the textual content of the element and its children
         """
-        text = ''
-        if element.text is not None:
-            text += element.text
-        for child in element:
-            text += self._get_element_text(child)
+        # itertext walks the subtree in C, much faster than a Python-level recursion
+        text = ''.join(element.itertext())
         if element.tail is not None:
             text += element.tail
         return text
@@ -340,10 +720,9 @@ class HocrTransform:
         """
         out = (0, 0, 0, 0)
         if 'title' in element.attrib:
-            matches = self.boxPattern.search(element.attrib['title'])
+            matches = BBOX_PATTERN.search(element.attrib['title'])
             if matches:
-                coords = matches.group(1).split()
-                out = self.rect._make(int(coords[n]) for n in range(4))
+                out = self.rect(int(matches[1]), int(matches[2]), int(matches[3]), int(matches[4]))
         return out
 
     def pt_from_pixel(self, pxl):
@@ -359,11 +738,7 @@ class HocrTransform:
         - is available in the helvetica facetype
         - does not contain any ligature (to allow easy search in the PDF file)
         """
-        # The 'u' before the character to replace indicates that it is a
-        # unicode character
-        s = s.replace(u"ﬂ", "fl")
-        s = s.replace(u"ﬁ", "fi")
-        return s
+        return s.translate(LIGATURE_TABLE)
 
     def to_pdf(self, out_file_name, image_file_name=None, show_bounding_boxes=False, fontname="Helvetica",
                invisible_text=True):
@@ -385,8 +760,7 @@ class HocrTransform:
         # light blue for bounding box of paragraph
         pdf.setFillColorRGB(0, 1, 1)
         pdf.setLineWidth(0)  # no line for bounding box
-        for elem in self.hocr.findall(
-                ".//%sp[@class='%s']" % (self.xmlns, "ocr_par")):
+        for elem in self.hocr.iterfind(self._xpath_par):
             elemtxt = self._get_element_text(elem).rstrip()
             if len(elemtxt) == 0:
                 continue
@@ -397,34 +771,50 @@ class HocrTransform:
                 pdf.rect(pt.x1, self.height - pt.y2, pt.x2 - pt.x1, pt.y2 - pt.y1, fill=1)
         # check if element with class 'ocrx_word' are available
         # otherwise use 'ocr_line' as fallback
-        elemclass = "ocr_line"
-        if self.hocr.find(".//%sspan[@class='ocrx_word']" % self.xmlns) is not None:
-            elemclass = "ocrx_word"
+        elemclass_xpath = self._xpath_line
+        if next(self.hocr.iterfind(self._xpath_word), None) is not None:
+            elemclass_xpath = self._xpath_word
         # itterate all text elements
         # light green for bounding box of word/line
         pdf.setStrokeColorRGB(1, 0, 0)
         pdf.setLineWidth(0.5)  # bounding box line width
         pdf.setDash(6, 3)  # bounding box is dashed
         pdf.setFillColorRGB(0, 0, 0)  # text in black
-        for elem in self.hocr.findall(".//%sspan[@class='%s']" % (self.xmlns, elemclass)):
+        font_width_lut = get_font_width_lut(fontname)
+        string_width = pdfmetrics.stringWidth  # hoisted - avoids attribute lookups in the word loop
+        elems = list(self.hocr.iterfind(elemclass_xpath))
+        if len(elems) > 0:
+            # Scale every bbox from pixel to pt with one vectorized multiply instead of per-element divides
+            pt_coords = np.array([self.element_coordinates(elem) for elem in elems], dtype=np.float64) * (inch / self.dpi)
+        else:
+            pt_coords = np.empty((0, 4), dtype=np.float64)
+        for elem, (pt_x1, pt_y1, pt_x2, pt_y2) in zip(elems, pt_coords):
             elemtxt = self._get_element_text(elem).rstrip()
             elemtxt = self.replace_unsupported_chars(elemtxt)
             if len(elemtxt) == 0:
                 continue
-            pxl_coords = self.element_coordinates(elem)
-            pt = self.pt_from_pixel(pxl_coords)
             # draw the bbox border
             if show_bounding_boxes:
-                pdf.rect(pt.x1, self.height - pt.y2, pt.x2 - pt.x1, pt.y2 - pt.y1, fill=0)
+                pdf.rect(pt_x1, self.height - pt_y2, pt_x2 - pt_x1, pt_y2 - pt_y1, fill=0)
             text = pdf.beginText()
-            fontsize = pt.y2 - pt.y1
+            fontsize = pt_y2 - pt_y1
             text.setFont(fontname, fontsize)
             if invisible_text:
                 text.setTextRenderMode(3)  # Invisible (indicates OCR text)
             # set cursor to bottom left corner of bbox (adjust for dpi)
-            text.setTextOrigin(pt.x1, self.height - pt.y2)
+            text.setTextOrigin(pt_x1, self.height - pt_y2)
             # scale the width of the text to fill the width of the bbox
-            text.setHorizScale(100 * (pt.x2 - pt.x1) / pdf.stringWidth(elemtxt, fontname, fontsize))
+            text_width = None
+            if font_width_lut is not None:
+                try:
+                    # Vectorized sum of per-character advances (much cheaper than stringWidth's Python loop)
+                    char_codes = np.frombuffer(elemtxt.encode('latin-1'), np.uint8)
+                    text_width = float(font_width_lut[char_codes].sum()) * fontsize / 1000.0
+                except UnicodeEncodeError:
+                    text_width = None  # Chars outside latin-1, let reportlab measure them
+            if text_width is None:
+                text_width = string_width(elemtxt, fontname, fontsize)
+            text.setHorizScale(100 * (pt_x2 - pt_x1) / text_width)
             # write the text to the page
             text.textLine(elemtxt)
             pdf.drawText(text)
@@ -474,8 +864,11 @@ class Pdf2PdfOcr:
     tesseract_version = 3
     """Tesseract version installed on system"""
 
-    extension_images = "jpg"
-    """Temp images will use this extension. Using jpg to avoid big temp files in pdf with a lot of pages"""
+    tool_probe_cache = dict()
+    """Class level cache of external tool capability/version probes, keyed by tool path (dir mode creates one instance per file)"""
+
+    extension_images = "png"
+    """Temp images will use this extension. PNG avoids the lossy JPEG encode+decode round trip on every page"""
 
     output_file = ""
     """The PDF output file"""
@@ -486,14 +879,7 @@ class Pdf2PdfOcr:
     path_this_python = sys.executable
     """Path for python in this system"""
 
-    shell_mode = (sys.platform == "win32")
-    """How to run external process? In Windows use Shell=True
-    http://stackoverflow.com/questions/5658622/python-subprocess-popen-environment-path
-    "Also, on Windows with shell=False, it pays no attention to PATH at all,
-    and will only look in relative to the current working directory."
-    """
-
-    def __init__(self, args, override_input_file=None):
+    def __init__(self, args, override_input_file=None, override_cpu_to_use=None):
         super().__init__()
         self.log_time_format = '%Y-%m-%d %H:%M:%S.%f'
         #
@@ -511,6 +897,7 @@ class Pdf2PdfOcr:
         self.ignore_existing_text = args.ignore_existing_text
         self.blank_pages = []
         self.blank_pages_dimensions = []
+        self.image_probe_results = dict()
         self.check_protection_mode = args.check_protection_mode
         self.avoid_high_pages_mode = args.max_pages is not None
         self.avoid_high_pages_pages = args.max_pages
@@ -553,6 +940,8 @@ class Pdf2PdfOcr:
         if self.text_generation_strategy not in ["tesseract", "native"]:
             raise Pdf2PdfOcrException("{0} is not a valid text generation strategy. Exiting.".format(self.text_generation_strategy))
         self.ocr_ignored = False
+        self.pipeline_did_ocr = False
+        self.first_page_area_cache = dict()
         self.ocr_engine = args.ocr_engine
         if self.ocr_engine not in ["tesseract", "cuneiform", "no_ocr"]:
             raise Pdf2PdfOcrException("{0} is not a valid ocr engine. Exiting.".format(self.ocr_engine))
@@ -564,12 +953,17 @@ class Pdf2PdfOcr:
         if not os.path.isfile(self.input_file):
             raise Pdf2PdfOcrException("{0} not found. Exiting.".format(self.input_file))
         self.input_file = os.path.abspath(self.input_file)
+        # Stat once - size (and mtime, for cache keys) are reused by later checks
+        self.input_file_stat = os.stat(self.input_file)
+        self.input_file_size_kb = self.input_file_stat.st_size / 1024
         self.input_file_type = ""
         #
         self.input_file_has_text = False
         self.input_file_is_encrypted = False
         self.input_file_metadata = dict()
         self.input_file_number_of_pages = None
+        self.input_pdf_reader = None
+        """PyPDF2 reader of the input file, stashed by validate_pdf_input_file so later checks reuse one parse"""
         #
         self.debug("Temp dir is {0}".format(self.tmp_dir))
         self.debug("Prefix is {0}".format(self.prefix))
@@ -577,23 +971,48 @@ class Pdf2PdfOcr:
         self.script_dir = os.path.dirname(os.path.abspath(__file__)) + os.path.sep
         self.debug("Script dir is {0}".format(self.script_dir))
         #
-        self.cpu_to_use = int(multiprocessing.cpu_count() * self.parallel_threshold)
-        if self.cpu_to_use == 0:
-            self.cpu_to_use = 1
+        if override_cpu_to_use is not None:
+            # Dir mode runs several instances at once and splits the CPU budget between them
+            self.cpu_to_use = max(1, override_cpu_to_use)
+        else:
+            self.cpu_to_use = int(multiprocessing.cpu_count() * self.parallel_threshold)
+            if self.cpu_to_use == 0:
+                self.cpu_to_use = 1
         self.debug("Parallel operations will use {0} CPUs".format(self.cpu_to_use))
         #
-        self.main_pool = multiprocessing.Pool(self.cpu_to_use)
+        self.pool_worker_config = {
+            "extra_ocr_flag": self.extra_ocr_flag,
+            "tess_langs": self.tess_langs,
+            "tess_psm": self.tess_psm,
+            "tmp_dir": self.tmp_dir,
+            "path_tesseract": self.path_tesseract,
+            "path_cuneiform": self.path_cuneiform,
+            "text_generation_strategy": self.text_generation_strategy,
+            "delete_temps": self.delete_temps,
+            "tesseract_can_textonly_pdf": self.tesseract_can_textonly_pdf,
+            "path_qpdf": self.path_qpdf,
+            "verbose_mode": self.verbose_mode,
+        }
+        self.ocr_progress_counter = multiprocessing.Value('i', 0)
+        self.main_pool = futures.ProcessPoolExecutor(self.cpu_to_use, initializer=pool_worker_init,
+                                                     initargs=(self.pool_worker_config, self.ocr_progress_counter))
         #
 
     def check_external_tools(self):
-        """Check if external tools are available, aborting or warning in case of any error."""
+        """
+        Check if external tools are available, aborting or warning in case of any error.
+        The independent version/capability probes each fork a tool and block on it, so
+        they run concurrently on a small thread pool - constructor latency becomes the
+        slowest probe instead of the sum of all of them.
+        """
+        probe_pool = futures.ThreadPoolExecutor(max_workers=4)
         self.path_tesseract = shutil.which(self.cmd_tesseract)
         if self.path_tesseract is None:
             eprint("tesseract not found. Aborting...")
             sys.exit(1)
         #
-        self.tesseract_can_textonly_pdf = self.test_tesseract_textonly_pdf()
-        self.tesseract_version = self.get_tesseract_version()
+        future_tesseract_textonly = probe_pool.submit(self.test_tesseract_textonly_pdf)
+        future_tesseract_version = probe_pool.submit(self.get_tesseract_version)
         #
         self.path_cuneiform = shutil.which(self.cmd_cuneiform)
         if self.path_cuneiform is None:
@@ -623,8 +1042,7 @@ class Pdf2PdfOcr:
         if self.path_pdftoppm is None:
             eprint("pdftoppm (poppler) not found. Aborting...")
             sys.exit(1)
-        if self.get_pdftoppm_version() <= parse_version("0.70.0"):
-            self.log("External tool 'pdftoppm' is outdated. Please upgrade poppler")
+        future_pdftoppm_version = probe_pool.submit(self.get_pdftoppm_version)
         #
         self.path_pdffonts = shutil.which(self.cmd_pdffonts)
         if self.path_pdffonts is None:
@@ -641,14 +1059,24 @@ class Pdf2PdfOcr:
             eprint("ghostscript not found. Param 'ignore-existing-text' will not work...")
         #
         self.path_qpdf = shutil.which(self.cmd_qpdf)
+        future_qpdf_version = None
         if self.path_qpdf is None:
             self.log("External tool 'qpdf' not available. Merge can be slow")
         else:
-            qpdf_version = self.get_qpdf_version()
+            future_qpdf_version = probe_pool.submit(self.get_qpdf_version)
+        #
+        # Collect the probe results (all were running while the paths above were resolved)
+        self.tesseract_can_textonly_pdf = future_tesseract_textonly.result()
+        self.tesseract_version = future_tesseract_version.result()
+        if future_pdftoppm_version.result() <= parse_version("0.70.0"):
+            self.log("External tool 'pdftoppm' is outdated. Please upgrade poppler")
+        if future_qpdf_version is not None:
+            qpdf_version = future_qpdf_version.result()
             minimum_version = "8.4.1"
             if qpdf_version < parse_version(minimum_version):
                 self.log("External tool 'qpdf' is not on minimum version ({0}). Merge can be slow".format(minimum_version))
                 self.path_qpdf = None
+        probe_pool.shutdown()
         #
 
     def debug(self, param):
@@ -666,6 +1094,39 @@ class Pdf2PdfOcr:
         except:
             pass
 
+    def submit_to_pool(self, param_worker, param_args, param_on_done, param_on_error):
+        """Submit one task on the executor and route its completion to a success or error callback."""
+        def route_completion(completed_future):
+            task_error = completed_future.exception()
+            if task_error is not None:
+                param_on_error(task_error)
+            else:
+                param_on_done(completed_future.result())
+        self.main_pool.submit(param_worker, *param_args).add_done_callback(route_completion)
+
+    def dispatch_with_progress(self, param_worker, param_args_list, param_progress_message=None):
+        """
+        Submit one task per argument tuple on the executor and wait for all of them.
+        Completion callbacks feed a counter, so progress comes from task completions instead of
+        scanning the temp dir, and the waits block on the executor result events instead of
+        sleeping (the 5 second timeout only exists to honor the cleanup escape and log progress).
+        Returns the list of Future objects, in submission order.
+        """
+        done_counter = {"done": 0}
+
+        def on_task_done(_):
+            done_counter["done"] += 1  # Callback runs on the executor result thread - plain int increment is atomic under the GIL
+
+        task_futures = [self.main_pool.submit(param_worker, *tuple(task_args)) for task_args in param_args_list]
+        for task_future in task_futures:
+            task_future.add_done_callback(on_task_done)
+        pending_futures = set(task_futures)
+        while pending_futures and (self.main_pool is not None):
+            _, pending_futures = futures.wait(pending_futures, timeout=5)
+            if pending_futures and (self.main_pool is not None) and (param_progress_message is not None):
+                self.log(param_progress_message.format(done_counter["done"], len(task_futures)))
+        return task_futures
+
     def cleanup(self):
         #
         # Try to kill all child process still alive (in timeout situation)
@@ -678,11 +1139,10 @@ class Pdf2PdfOcr:
                 except:
                     pass  # By design
         #
-        # Cleanup the pool
+        # Cleanup the executor - queued tasks are cancelled, running ones finish quickly
+        # because their external child processes were just killed above
         if self.main_pool:
-            self.main_pool.close()
-            self.main_pool.terminate()
-            self.main_pool.join()
+            self.main_pool.shutdown(wait=False, cancel_futures=True)
             self.main_pool = None  # Signal for pool to stop waiting in while loops
         #
         # Cleanup temp files
@@ -702,17 +1162,29 @@ class Pdf2PdfOcr:
         self.debug("User conversion params: {0}".format(self.user_convert_params))
         self.define_output_files()
         self.initial_cleanup()
-        self.convert_input_to_images()
+        piped_ocr = self.try_piped_ocr()
+        if piped_ocr:
+            self.pipeline_did_ocr = True
+            pipelined = True  # Rendering, OCR and text extraction all happened inside the pipe workers
+        else:
+            pipelined = self.try_pipelined_stages()
+        if not pipelined:
+            self.convert_input_to_images()
         # TODO - create param to user pass input page range for OCR
         image_file_list = sorted(glob.glob(self.tmp_dir + "{0}*.{1}".format(self.prefix, self.extension_images)))
         if self.input_file_number_of_pages is None:
             self.input_file_number_of_pages = len(image_file_list)
         self.check_avoid_high_pages()
         # TODO - create param to user pass image filters before OCR
-        self.check_blank_pages(image_file_list)
-        self.autorotate_info(image_file_list)
-        self.deskew(image_file_list)
-        self.external_ocr(image_file_list)
+        if not pipelined:
+            self.preprocess_images(image_file_list)
+        if self.pipeline_did_ocr:
+            # The pipeline already OCRed every non blank page - only the blank placeholders are missing
+            self.create_blank_page_pdfs()
+            self.log("OCR completed")
+            self.ocr_ignored = False
+        else:
+            self.external_ocr(image_file_list)
         if not self.ocr_ignored:
             self.join_ocred_pdf()
             self.create_text_output()
@@ -766,22 +1238,37 @@ This software is free, but if you like it, please donate to support new features
             self.cleanup()
             raise Pdf2PdfOcrException("Rebuild from images and ignore existing text won't work together")
 
+    def get_first_page_area(self, param_pdf_file_path):
+        """
+        Area (width x height) of the first page mediabox, memoized per path because
+        _merge_ocr can process the same file twice (final output plus the repair retry).
+        pikepdf reads the geometry in native code without building Python page objects;
+        PyPDF2 is the fallback. Returns 0 when the geometry cannot be read.
+        """
+        if param_pdf_file_path in self.first_page_area_cache:
+            return self.first_page_area_cache[param_pdf_file_path]
+        try:
+            if pikepdf is not None:
+                with pikepdf.open(param_pdf_file_path) as pdf_data:
+                    first_page_rect = pdf_data.pages[0].mediabox
+                    first_page_area = float(first_page_rect[2] - first_page_rect[0]) * float(first_page_rect[3] - first_page_rect[1])
+            else:
+                with open(param_pdf_file_path, "rb") as pdf_f:
+                    pdf_data = PyPDF2.PdfReader(pdf_f, strict=False)
+                    first_page_rect = pdf_data.pages[0].mediaBox
+                    first_page_area = float(first_page_rect.getWidth() * first_page_rect.getHeight())
+        except Exception:
+            eprint("Warning: could not read page geometry of '{0}'. Merge may fail, please check the file.".format(param_pdf_file_path))
+            first_page_area = 0
+        self.first_page_area_cache[param_pdf_file_path] = first_page_area
+        return first_page_area
+
     def _merge_ocr(self, image_pdf_file_path, text_pdf_file_path, result_pdf_file_path, tag):
         # Merge OCR background PDF into the main PDF document making a PDF sandwich
         self.debug("Merging with OCR")
         if self.path_qpdf is not None:
-            try:
-                with open(image_pdf_file_path, "rb") as img_f:
-                    img_data = PyPDF2.PdfReader(img_f, strict=False)
-                    first_page_img_rect = img_data.pages[0].mediaBox
-                    first_page_img_area = first_page_img_rect.getWidth() * first_page_img_rect.getHeight()
-            except PdfReadError:
-                eprint("Warning: could not read input file page geometry. Merge may fail, please check input file.")
-                first_page_img_area = 0
-            with open(text_pdf_file_path, "rb") as txt_f:
-                txt_data = PyPDF2.PdfReader(txt_f, strict=False)
-                first_page_txt_rect = txt_data.pages[0].mediaBox
-                first_page_txt_area = first_page_txt_rect.getWidth() * first_page_txt_rect.getHeight()
+            first_page_img_area = self.get_first_page_area(image_pdf_file_path)
+            first_page_txt_area = self.get_first_page_area(text_pdf_file_path)
             #
             # Define overlay / underlay based on biggest page
             if first_page_txt_area < first_page_img_area:
@@ -792,17 +1279,15 @@ This software is free, but if you like it, please donate to support new features
             pqpdf = subprocess.Popen(
                 qpdf_command,
                 stdout=subprocess.DEVNULL,
-                stderr=open(self.tmp_dir + "err_merge-qpdf-{0}-{1}.log".format(self.prefix, tag), "wb"),
-                shell=self.shell_mode)
+                stderr=open(self.tmp_dir + "err_merge-qpdf-{0}-{1}.log".format(self.prefix, tag), "wb"))
             pqpdf.wait()
         else:
-            pmulti = subprocess.Popen(
-                [self.path_this_python, self.script_dir + 'pdf2pdfocr_multibackground.py',
-                 image_pdf_file_path, text_pdf_file_path, result_pdf_file_path],
-                stdout=subprocess.DEVNULL,
-                stderr=open(self.tmp_dir + "err_merge-multiback-{0}-{1}.log".format(self.prefix, tag), "wb"),
-                shell=self.shell_mode)
-            pmulti.wait()
+            # In-process call - spawning a fresh interpreter per merge paid Python startup every time
+            try:
+                pdf2pdfocr_multibackground.merge(image_pdf_file_path, text_pdf_file_path, result_pdf_file_path)
+            except Exception as e_merge:
+                # Keep the old contract: a failed merge leaves no result file and the caller retries/repairs
+                eprint("Warning: multibackground merge failed ({0}-{1}): {2}".format(self.prefix, tag, e_merge))
 
     def build_final_output(self):
         # Start building final PDF.
@@ -829,25 +1314,16 @@ This software is free, but if you like it, please donate to support new features
     def rebuild_and_merge(self):
         eprint("Warning: metadata wiped from final PDF file (original file is not an unprotected PDF / "
                "forcing rebuild from extracted images / using deskew)")
-        # Convert presets
-        # Please read http://www.imagemagick.org/Usage/quantize/#colors_two
-        preset_fast = "-threshold 60% -compress Group4"
-        preset_best = "-colors 2 -colorspace gray -normalize -threshold 60% -compress Group4"
-        preset_grayscale = "-threshold 85% -morphology Dilate Diamond -compress Group4"
-        preset_jpeg = "-strip -interlace Plane -gaussian-blur 0.05 -quality 50% -compress JPEG"
-        preset_jpeg2000 = "-quality 32% -compress JPEG2000"
-        #
         rebuild_list = sorted(glob.glob(self.tmp_dir + self.prefix + "*." + self.extension_images))
         #
         if self.user_convert_params == "smart":
-            checkimg_pool_map = self.main_pool.starmap_async(do_check_img_greyscale, zip(rebuild_list))
-            checkimg_wait_rounds = 0
-            while not checkimg_pool_map.ready() and (self.main_pool is not None):
-                checkimg_wait_rounds += 1
-                if checkimg_wait_rounds % 10 == 0:
-                    self.log("Checking page colors...")
-                time.sleep(0.5)
-            result_check_img = checkimg_pool_map.get()
+            if all(x in self.image_probe_results for x in rebuild_list):
+                # preprocess_images already probed these images - no need to decode them again
+                result_check_img = [self.image_probe_results[x][0] for x in rebuild_list]
+            else:
+                checkimg_results = self.dispatch_with_progress(do_probe_image, zip(rebuild_list),
+                                                               "Checking page colors. {0}/{1} pages completed...")
+                result_check_img = [task_future.result()[0] for task_future in checkimg_results]
             if all(result_check_img):
                 self.log("No color pages detected. Smart mode will use 'best' preset.")
                 self.user_convert_params = "best"
@@ -855,45 +1331,25 @@ This software is free, but if you like it, please donate to support new features
                 self.log("Color pages detected. Smart mode will use 'jpeg' preset.")
                 self.user_convert_params = "jpeg"
         #
-        if self.user_convert_params == "fast":
-            convert_params = preset_fast
-        elif self.user_convert_params == "best":
-            convert_params = preset_best
-        elif self.user_convert_params == "grayscale":
-            convert_params = preset_grayscale
-        elif self.user_convert_params == "jpeg":
-            convert_params = preset_jpeg
-        elif self.user_convert_params == "jpeg2000":
-            convert_params = preset_jpeg2000
-        else:
-            convert_params = self.user_convert_params
-        # Handle default case
+        # Preset name, direct parameters, or the default ('best') when nothing was given
+        convert_params = CONVERT_PRESETS.get(self.user_convert_params, self.user_convert_params)
         if convert_params == "":
-            convert_params = preset_best
+            convert_params = CONVERT_PRESETS["best"]
         #
         self.log("Rebuilding PDF from images")
-        rebuild_pool_map = self.main_pool.starmap_async(do_rebuild,
-                                                        zip(rebuild_list,
-                                                            itertools.repeat(self.path_convert),
-                                                            itertools.repeat(convert_params),
-                                                            itertools.repeat(self.tmp_dir),
-                                                            itertools.repeat(self.shell_mode)))
-        rebuild_wait_rounds = 0
-        while not rebuild_pool_map.ready() and (self.main_pool is not None):
-            rebuild_wait_rounds += 1
-            pages_processed = len(glob.glob(self.tmp_dir + "REBUILD_" + self.prefix + "*.pdf"))
-            if rebuild_wait_rounds % 10 == 0:
-                self.log("Waiting for PDF rebuild to complete. {0}/{1} pages completed...".format(pages_processed, self.input_file_number_of_pages))
-            time.sleep(0.5)
+        # One multi-image convert call per worker instead of one per image (plus one merge at the end)
+        rebuild_group_size = math.ceil(len(rebuild_list) / self.cpu_to_use)
+        rebuild_groups = [rebuild_list[i:i + rebuild_group_size] for i in range(0, len(rebuild_list), rebuild_group_size)]
+        rebuild_worker = functools.partial(do_rebuild, param_prefix=self.prefix, param_path_convert=self.path_convert,
+                                           param_convert_params=convert_params, param_tmp_dir=self.tmp_dir,
+                                           param_verbose_mode=self.verbose_mode)
+        self.dispatch_with_progress(rebuild_worker, zip(rebuild_groups, range(len(rebuild_groups))),
+                                    "Waiting for PDF rebuild to complete. {0}/{1} image groups completed...")
         #
         rebuilt_pdf_file_list = sorted(glob.glob(self.tmp_dir + "REBUILD_{0}*.pdf".format(self.prefix)))
         self.debug("We have {0} rebuilt PDF files".format(len(rebuilt_pdf_file_list)))
         if len(rebuilt_pdf_file_list) > 0:
-            pdf_merger = PyPDF2.PdfMerger()
-            for rebuilt_pdf_file in rebuilt_pdf_file_list:
-                pdf_merger.append(PyPDF2.PdfReader(rebuilt_pdf_file, strict=False))
-            pdf_merger.write(self.tmp_dir + self.prefix + "-input_unprotected.pdf")
-            pdf_merger.close()
+            self.merge_pdf_files(rebuilt_pdf_file_list, self.tmp_dir + self.prefix + "-input_unprotected.pdf")
         else:
             self.cleanup()
             raise Pdf2PdfOcrException("No PDF files generated after image rebuilding. This is not expected. Aborting.")
@@ -911,14 +1367,13 @@ This software is free, but if you like it, please donate to support new features
         prepair1 = subprocess.Popen(
             [self.path_pdf2ps, self.input_file, self.tmp_dir + self.prefix + "-fixPDF.ps"],
             stdout=subprocess.DEVNULL,
-            stderr=open(self.tmp_dir + "err_pdf2ps-{0}.log".format(self.prefix), "wb"),
-            shell=self.shell_mode)
+            stderr=open(self.tmp_dir + "err_pdf2ps-{0}.log".format(self.prefix), "wb"))
         prepair1.wait()
         prepair2 = subprocess.Popen([self.path_ps2pdf, self.tmp_dir + self.prefix + "-fixPDF.ps",
                                      self.tmp_dir + self.prefix + "-fixPDF.pdf"],
                                     stdout=subprocess.DEVNULL,
                                     stderr=open(self.tmp_dir + "err_ps2pdf-{0}.log".format(self.prefix),
-                                                "wb"), shell=self.shell_mode)
+                                                "wb"))
         prepair2.wait()
         #
         self._merge_ocr((self.tmp_dir + self.prefix + "-fixPDF.pdf"),
@@ -929,26 +1384,44 @@ This software is free, but if you like it, please donate to support new features
         # Create final text output
         if self.create_text_mode:
             text_files = sorted(glob.glob(self.tmp_dir + self.prefix + "*.txt"))
-            text_io_wrapper = open(self.output_file_text, 'wb')
-            with text_io_wrapper as outfile:
+            with open(self.output_file_text, 'wb') as outfile:
                 for fname in text_files:
                     with open(fname, 'rb') as infile:
-                        outfile.write(infile.read())
-            #
-            text_io_wrapper.close()
+                        # Chunked kernel-level copy - constant memory however large the page text is
+                        shutil.copyfileobj(infile, outfile, 1024 * 1024)
             #
             self.log("Created final text file")
 
+    def merge_pdf_files(self, param_pdf_file_list, param_output_file):
+        """
+        Concatenate single page PDF files into one document. qpdf copies the page objects
+        in native code ('--empty --pages ... --'), which is much faster than PyPDF2
+        re-parsing every page in Python; PyPDF2 stays as the fallback when qpdf is absent.
+        Returns True on success.
+        """
+        if self.path_qpdf is not None:
+            qpdf_command = [self.path_qpdf, "--empty", "--pages"] + param_pdf_file_list + ["--", param_output_file]
+            pqpdf = subprocess.Popen(qpdf_command, stdout=subprocess.DEVNULL,
+                                     stderr=open(self.tmp_dir + "err_merge_pdf_{0}.log".format(self.prefix), "ab"))
+            pqpdf.wait()
+            if pqpdf.returncode in [0, 3]:  # 3 means warnings only
+                return True
+            self.log("qpdf merge failed with code {0}. Falling back to PyPDF2...".format(pqpdf.returncode))
+        pdf_merger = PyPDF2.PdfMerger()
+        for pdf_file in param_pdf_file_list:
+            pdf_merger.append(PyPDF2.PdfReader(pdf_file, strict=False))
+        # 1 MB buffer - PyPDF2 emits many tiny writes for a whole document
+        with open(param_output_file, 'wb', buffering=1 << 20) as merger_output:
+            pdf_merger.write(merger_output)
+        pdf_merger.close()
+        return True
+
     def join_ocred_pdf(self):
         # Join PDF files into one file that contains all OCR "backgrounds"
         text_pdf_file_list = sorted(glob.glob(self.tmp_dir + "{0}*.{1}".format(self.prefix, "pdf")))
         self.debug("We have {0} ocr'ed files".format(len(text_pdf_file_list)))
         if len(text_pdf_file_list) > 0:
-            pdf_merger = PyPDF2.PdfMerger()
-            for text_pdf_file in text_pdf_file_list:
-                pdf_merger.append(PyPDF2.PdfReader(text_pdf_file, strict=False))
-            pdf_merger.write(self.tmp_dir + self.prefix + "-ocr.pdf")
-            pdf_merger.close()
+            self.merge_pdf_files(text_pdf_file_list, self.tmp_dir + self.prefix + "-ocr.pdf")
         else:
             self.cleanup()
             raise Pdf2PdfOcrException("No PDF files generated after OCR. This is not expected. Aborting.")
@@ -958,43 +1431,40 @@ This software is free, but if you like it, please donate to support new features
     def external_ocr(self, image_file_list):
         if self.ocr_engine in ["cuneiform", "tesseract"]:
             self.log("Starting OCR with {0}...".format(self.ocr_engine))
-            image_list_for_external_ocr = [x for x in image_file_list if x not in self.blank_pages]
+            blank_pages_set = set(self.blank_pages)  # O(1) membership - blank_pages stays a list to keep dimension pairing
+            image_list_for_external_ocr = [x for x in image_file_list if x not in blank_pages_set]
+            # Only the per-page image path travels over IPC - invariants live in the worker configuration.
+            # One future per page keeps dispatch fully dynamic, so a slow page at the tail never
+            # strands other pages behind it while workers sit idle.
+            use_tesseract_batch = (self.ocr_engine == "tesseract" and self.text_generation_strategy == "tesseract"
+                                   and self.tesseract_can_textonly_pdf and len(image_list_for_external_ocr) > 1)
             if self.ocr_engine == "cuneiform":
-                ocr_pool_map = self.main_pool.starmap_async(do_ocr_cuneiform,
-                                                            zip(image_list_for_external_ocr,
-                                                                itertools.repeat(self.extra_ocr_flag),
-                                                                itertools.repeat(self.tess_langs),
-                                                                itertools.repeat(self.tmp_dir),
-                                                                itertools.repeat(self.shell_mode),
-                                                                itertools.repeat(self.path_cuneiform)))
+                ocr_futures = [self.main_pool.submit(do_ocr_cuneiform_task, t_image) for t_image in image_list_for_external_ocr]
+            elif use_tesseract_batch:
+                # One tesseract process per shard, so model load happens cpu_to_use times instead of once per page
+                shard_size = math.ceil(len(image_list_for_external_ocr) / self.cpu_to_use)
+                ocr_shards = [(shard_idx, image_list_for_external_ocr[i:i + shard_size])
+                              for shard_idx, i in enumerate(range(0, len(image_list_for_external_ocr), shard_size))]
+                ocr_futures = [self.main_pool.submit(do_ocr_tesseract_batch_task, t_shard) for t_shard in ocr_shards]
             elif self.ocr_engine == "tesseract":
-                ocr_pool_map = self.main_pool.starmap_async(do_ocr_tesseract,
-                                                            zip(image_list_for_external_ocr,
-                                                                itertools.repeat(self.extra_ocr_flag),
-                                                                itertools.repeat(self.tess_langs),
-                                                                itertools.repeat(self.tess_psm),
-                                                                itertools.repeat(self.tmp_dir),
-                                                                itertools.repeat(self.shell_mode),
-                                                                itertools.repeat(self.path_tesseract),
-                                                                itertools.repeat(self.text_generation_strategy),
-                                                                itertools.repeat(self.delete_temps),
-                                                                itertools.repeat(self.tesseract_can_textonly_pdf)))
+                ocr_futures = [self.main_pool.submit(do_ocr_tesseract_task, t_image) for t_image in image_list_for_external_ocr]
             else:
-                ocr_pool_map = None  # Should never happen
+                ocr_futures = []  # Should never happen
             #
-            ocr_rounds = 0
-            while not ocr_pool_map.ready() and (self.main_pool is not None):
-                ocr_rounds += 1
-                pages_processed = len(glob.glob(self.tmp_dir + self.prefix + "*.tmp"))
-                if ocr_rounds % 10 == 0:
-                    self.log("Waiting for OCR to complete. {0}/{1} pages completed...".format(pages_processed, self.input_file_number_of_pages))
-                time.sleep(0.5)
+            pending_futures = set(ocr_futures)
+            while pending_futures and (self.main_pool is not None):
+                # wait() blocks on the executor result events - the 5 second timeout only paces the progress log
+                done_futures, pending_futures = futures.wait(pending_futures, timeout=5, return_when=futures.FIRST_COMPLETED)
+                for done_future in done_futures:
+                    ocr_error = done_future.exception()
+                    if ocr_error is not None:
+                        # Keep the old fault tolerance: a failed page surfaces later as a missing OCR PDF
+                        eprint("Warning: OCR worker error: {0}".format(ocr_error))
+                if pending_futures and (self.main_pool is not None) and (len(done_futures) == 0):
+                    self.log("Waiting for OCR to complete. {0}/{1} pages completed...".format(self.ocr_progress_counter.value,
+                                                                                              self.input_file_number_of_pages))
             #
-            if len(self.blank_pages) > 0:
-                for idx, blank_page_img in enumerate(self.blank_pages):
-                    blank_page_dimension = self.blank_pages_dimensions[idx]
-                    pdf_file_img = blank_page_img.replace("." + self.extension_images, ".pdf")
-                    do_create_blank_pdf(pdf_file_img, blank_page_dimension, self.image_resolution)
+            self.create_blank_page_pdfs()
             #
             self.log("OCR completed")
             self.ocr_ignored = False
@@ -1002,38 +1472,42 @@ This software is free, but if you like it, please donate to support new features
             self.log("OCR ignored")
             self.ocr_ignored = True
 
-    def check_blank_pages(self, image_file_list):
-        self.log("Checking blank pages")
-        colors_size_pool_map = self.main_pool.starmap_async(do_check_img_colors_size, zip(image_file_list))
-        while not colors_size_pool_map.ready() and (self.main_pool is not None):
-            time.sleep(0.5)
-        blank_map_values = colors_size_pool_map.get()
-        for idx, t_image in enumerate(image_file_list):
-            color_size_info = blank_map_values[idx]
-            is_blank = (color_size_info[0] is not None) and (len(color_size_info[0]) == 1)
-            if is_blank:
-                self.blank_pages.append(t_image)
-                self.blank_pages_dimensions.append(color_size_info[1])
-
-    def autorotate_info(self, image_file_list):
-        if self.use_autorotate:
-            self.debug("Calculating autorotate values...")
-            image_list_for_autorotate_info = [x for x in image_file_list if x not in self.blank_pages]
-            autorotate_pool_map = self.main_pool.starmap_async(do_autorotate_info,
-                                                               zip(image_list_for_autorotate_info,
-                                                                   itertools.repeat(self.shell_mode),
-                                                                   itertools.repeat(self.tmp_dir),
-                                                                   itertools.repeat(self.tess_langs),
-                                                                   itertools.repeat(self.path_tesseract),
-                                                                   itertools.repeat(self.tesseract_version)))
-            autorotate_rounds = 0
-            while not autorotate_pool_map.ready() and (self.main_pool is not None):
-                autorotate_rounds += 1
-                pages_processed = len(glob.glob(self.tmp_dir + self.prefix + "*.osd"))
-                if autorotate_rounds % 10 == 0:
-                    self.log("Waiting for autorotate. {0}/{1} pages completed...".format(pages_processed, self.input_file_number_of_pages))
-                time.sleep(0.5)
-            #
+    def create_blank_page_pdfs(self):
+        """Create the placeholder PDF for every page detected as blank (those pages skip OCR)."""
+        for idx, blank_page_img in enumerate(self.blank_pages):
+            blank_page_dimension = self.blank_pages_dimensions[idx]
+            pdf_file_img = blank_page_img.replace("." + self.extension_images, ".pdf")
+            do_create_blank_pdf(pdf_file_img, blank_page_dimension, self.image_resolution)
+
+    def build_pre_ocr_worker(self):
+        """Bind the fused preprocessing worker to the current configuration (shared by both stage paths)."""
+        return functools.partial(do_pre_ocr, param_temp_dir=self.tmp_dir, param_tess_lang=self.tess_langs,
+                                 param_path_tesseract=self.path_tesseract, param_tesseract_version=self.tesseract_version,
+                                 param_use_autorotate=self.use_autorotate,
+                                 param_deskew_threshold=(self.deskew_threshold if self.use_deskew_mode else None),
+                                 param_path_mogrify=self.path_mogrify, param_verbose_mode=self.verbose_mode)
+
+    def record_probe_result(self, param_image_file, param_probe_info):
+        """Keep probe results for reuse (rebuild_and_merge) and track blank pages."""
+        self.image_probe_results[param_image_file] = param_probe_info
+        if param_probe_info[1] is not None:  # getcolors(maxcolors=1) only returns a value for single color images
+            self.blank_pages.append(param_image_file)
+            self.blank_pages_dimensions.append(param_probe_info[2])
+
+    def preprocess_images(self, image_file_list):
+        """
+        Fused preprocessing stage: one pool task per page runs the blank/color probe and,
+        for non blank pages, autorotate info and deskew when enabled. One task per page
+        instead of one per stage cuts the scheduling round trips, and blank pages skip
+        the subprocess work entirely.
+        """
+        if self.use_deskew_mode:
+            self.debug("Applying deskew (will rebuild final PDF file)")
+        self.log("Preprocessing images")
+        probe_results = self.dispatch_with_progress(self.build_pre_ocr_worker(), zip(image_file_list),
+                                                    "Preprocessing images. {0}/{1} pages completed...")
+        for t_image, task_future in zip(image_file_list, probe_results):
+            self.record_probe_result(t_image, task_future.result())
 
     def autorotate_final_output(self):
         param_source_file = self.tmp_dir + self.prefix + "-OUTPUT.pdf"
@@ -1048,82 +1522,245 @@ This software is free, but if you like it, please donate to support new features
         #
         if self.use_autorotate and not skip_autorotate:
             self.debug("Autorotate final output")
-            file_source = open(param_source_file, 'rb')
-            pre_output_pdf = PyPDF2.PdfReader(file_source, strict=False)
-            final_output_pdf = PyPDF2.PdfWriter()
             rotation_angles = []
             osd_page_num = 0
             for osd_information_file in list_osd:
                 with open(osd_information_file, 'r') as f:
-                    osd_information_string = '[root]\n' + f.read()  # A dummy section to satisfy ConfigParser
-                f.close()
+                    osd_information_string = f.read()
                 osd_page_num += 1
-                config_osd = configparser.ConfigParser()
-                config_osd.read_file(io.StringIO(osd_information_string))
-                try:
-                    rotate_value = config_osd.getint('root', 'Rotate')
-                except configparser.NoOptionError:
+                osd_rotate_match = OSD_ROTATE_PATTERN.search(osd_information_string)
+                if osd_rotate_match is not None:
+                    rotate_value = int(osd_rotate_match.group(1))
+                else:
                     self.log("WARN: error reading rotate page value from page {0}. Assuming zero as rotation angle.".format(osd_page_num))
                     rotate_value = 0
                 rotation_angles.append(rotate_value)
             #
-            for i in range(len(pre_output_pdf.pages)):
-                page = pre_output_pdf.pages[i]
-                page.rotateClockwise(rotation_angles[i])
-                final_output_pdf.addPage(page)
-            #
-            with open(param_dest_file, 'wb') as f:
-                final_output_pdf.write(f)
-                f.close()
-            #
-            file_source.close()
+            rotation_applied = False
+            if self.path_qpdf is not None:
+                # qpdf applies rotation via the /Rotate key in native code instead of
+                # PyPDF2 re-serializing every page - one command for the whole document
+                pages_by_angle = dict()
+                for page_number, rotate_value in enumerate(rotation_angles, start=1):
+                    if (rotate_value % 360) != 0:
+                        pages_by_angle.setdefault(rotate_value % 360, []).append(str(page_number))
+                if len(pages_by_angle) == 0:
+                    os.replace(param_source_file, param_dest_file)  # Nothing to rotate
+                    rotation_applied = True
+                else:
+                    qpdf_command = [self.path_qpdf, param_source_file, param_dest_file]
+                    for rotate_value in sorted(pages_by_angle):
+                        qpdf_command.append("--rotate=+{0}:{1}".format(rotate_value, ",".join(pages_by_angle[rotate_value])))
+                    protate = subprocess.Popen(qpdf_command, stdout=subprocess.DEVNULL,
+                                               stderr=open(self.tmp_dir + "err_rotate-qpdf-{0}.log".format(self.prefix), "wb"))
+                    protate.wait()
+                    if protate.returncode in [0, 3]:  # 3 means warnings only
+                        rotation_applied = True
+                    else:
+                        self.log("qpdf rotate failed with code {0}. Falling back to PyPDF2...".format(protate.returncode))
+            if not rotation_applied:
+                with open(param_source_file, 'rb') as file_source:
+                    pre_output_pdf = PyPDF2.PdfReader(file_source, strict=False)
+                    final_output_pdf = PyPDF2.PdfWriter()
+                    for i in range(len(pre_output_pdf.pages)):
+                        page = pre_output_pdf.pages[i]
+                        page.rotateClockwise(rotation_angles[i])
+                        final_output_pdf.addPage(page)
+                    #
+                    # 1 MB buffer - PyPDF2 emits many tiny writes for a whole document
+                    with open(param_dest_file, 'wb', buffering=1 << 20) as f:
+                        final_output_pdf.write(f)
         else:
             # No autorotate, just rename the file to next method process correctly
             self.debug("Autorotate skipped")
-            os.rename(param_source_file, param_dest_file)
+            os.replace(param_source_file, param_dest_file)
+
+    def prepare_input_file_for_images(self):
+        """Return the PDF that pdftoppm should render - a text-stripped copy when requested, else the input itself."""
+        input_file_for_images = self.input_file
+        if self.ignore_existing_text:
+            input_file_for_images = self.tmp_dir + "_" + self.prefix + "-input_file_for_images.pdf"
+            # Credits for Kurt Pfeifle: https://stackoverflow.com/questions/24322338/remove-all-text-from-pdf-file
+            p_ignore_text = subprocess.Popen([self.path_gs, "-o", input_file_for_images, "-sDEVICE=pdfwrite", "-dFILTERTEXT", self.input_file],
+                                             stdout=subprocess.DEVNULL,
+                                             stderr=open(self.tmp_dir + "err_input_file_for_images-{0}.log".format(self.prefix),
+                                                         "wb"))
+            p_ignore_text.wait()
+        return input_file_for_images
+
+    def try_piped_ocr(self):
+        """
+        Fastest path: pdftoppm renders each page straight into tesseract's stdin, one
+        pipe pair per page dispatched on the pool - the page images never touch the
+        disk, halving I/O versus the render-then-OCR flow. Only applies when nothing
+        needs the page images: plain tesseract OCR with the 'tesseract' strategy and
+        textonly_pdf, no deskew/autorotate, no rebuild from images. Blank pages are
+        not detected here - they simply go through OCR like any other page.
+        Returns False when the preconditions do not hold.
+        """
+        if not (self.input_file_type == "application/pdf"
+                and self.input_file_number_of_pages is not None
+                and self.ocr_engine == "tesseract"
+                and self.text_generation_strategy == "tesseract"
+                and self.tesseract_can_textonly_pdf
+                and not self.use_autorotate
+                and not self.rebuild_pdf_from_images):
+            return False
+        self.check_avoid_high_pages()
+        self.log("Rendering and OCR in a single pipe per page (no intermediate page images)...")
+        input_file_for_images = self.prepare_input_file_for_images()
+        pipe_worker = functools.partial(do_pdftoppm_tesseract_pipe,
+                                        param_input_file=input_file_for_images,
+                                        param_image_resolution=self.image_resolution,
+                                        param_path_pdftoppm=self.path_pdftoppm,
+                                        param_extra_ocr_flag=self.extra_ocr_flag,
+                                        param_tess_lang=self.tess_langs,
+                                        param_tess_psm=self.tess_psm,
+                                        param_temp_dir=self.tmp_dir,
+                                        param_prefix=self.prefix,
+                                        param_path_tesseract=self.path_tesseract,
+                                        param_verbose_mode=self.verbose_mode)
+        pipe_results = self.dispatch_with_progress(pipe_worker, zip(range(1, self.input_file_number_of_pages + 1)),
+                                                   "Waiting for piped OCR to complete. {0}/{1} pages completed...")
+        # A failed page would leave a hole in the per page PDF sequence and silently shift
+        # every following text overlay - treat any failure as fatal, like the image path does
+        try:
+            pipe_result_codes = [task_future.result() for task_future in pipe_results]
+        except Exception as e:
+            self.cleanup()
+            raise Pdf2PdfOcrException("Fail to render/OCR pages in pipe mode ({0}). Exiting.".format(e))
+        if not all(ret_code == 0 for ret_code in pipe_result_codes):
+            self.cleanup()
+            raise Pdf2PdfOcrException("Fail to render/OCR pages in pipe mode. Exiting.")
+        return True
 
-    def deskew(self, image_file_list):
-        if self.use_deskew_mode:
-            self.debug("Applying deskew (will rebuild final PDF file)")
-            image_list_for_deskew = [x for x in image_file_list if x not in self.blank_pages]
-            deskew_pool_map = self.main_pool.starmap_async(do_deskew, zip(image_list_for_deskew, itertools.repeat(self.deskew_threshold),
-                                                                          itertools.repeat(self.shell_mode), itertools.repeat(self.path_mogrify)))
-            deskew_wait_rounds = 0
-            while not deskew_pool_map.ready() and (self.main_pool is not None):
-                deskew_wait_rounds += 1
-                # noinspection PyProtectedMember
-                pages_processed = len([x for x in deskew_pool_map._value if x is not None])
-                if deskew_wait_rounds % 10 == 0:
-                    self.log("Waiting for deskew to complete. {0}/{1} pages completed...".format(pages_processed, self.input_file_number_of_pages))
-                time.sleep(0.5)
+    def try_pipelined_stages(self):
+        """
+        Producer-consumer pipeline for PDF inputs with a known page count. The pdftoppm
+        ranges render in pool workers and, as each range completes, its pages flow
+        through the per page preprocess chain (blank probe, optional autorotate info,
+        optional deskew) and straight into per page OCR - so OCR of early pages overlaps
+        with rendering of late ones instead of idling at the stage barriers. Stage hops
+        happen on the pool result-handler thread via completion callbacks; this thread
+        only waits on the final event. Batched tesseract OCR needs the full page list,
+        so in that mode pages stop after preprocessing and external_ocr runs afterwards
+        as a single batched stage (same when OCR is ignored).
+        Returns False when the pipeline does not apply (non PDF input or unknown/small
+        page count) and the caller must run the sequential stages instead.
+        """
+        if self.input_file_type != "application/pdf":
+            return False
+        parallel_page_ranges = self.calculate_ranges()
+        if parallel_page_ranges is None:
+            return False
+        self.check_avoid_high_pages()  # Page count is known here - fail before spending render time
+        input_file_for_images = self.prepare_input_file_for_images()
+        use_tesseract_batch = (self.ocr_engine == "tesseract" and self.text_generation_strategy == "tesseract"
+                               and self.tesseract_can_textonly_pdf)
+        self.pipeline_did_ocr = (self.ocr_engine in ["cuneiform", "tesseract"]) and (not use_tesseract_batch)
+        if self.pipeline_did_ocr:
+            self.log("Converting input file to images (pipelined with preprocessing and {0} OCR)...".format(self.ocr_engine))
+        else:
+            self.log("Converting input file to images (pipelined with preprocessing)...")
+        #
+        pipeline_lock = threading.Lock()
+        pipeline_done = threading.Event()
+        pipeline_state = {"ranges_pending": len(parallel_page_ranges), "pages_in_flight": 0, "pages_done": 0, "render_failed": False}
+
+        def check_all_done():
+            # Callers must hold pipeline_lock
+            if (pipeline_state["ranges_pending"] == 0) and (pipeline_state["pages_in_flight"] == 0):
+                pipeline_done.set()
+
+        def finish_page():
+            with pipeline_lock:
+                pipeline_state["pages_in_flight"] -= 1
+                pipeline_state["pages_done"] += 1
+                check_all_done()
+
+        def fail_page(param_error):
+            # Keep the old fault tolerance: a failed page surfaces later as a missing OCR PDF
+            eprint("Warning: pipeline worker error: {0}".format(param_error))
+            finish_page()
+
+        def enter_ocr_stage(param_image_file):
+            if not self.pipeline_did_ocr:
+                finish_page()
+            elif self.ocr_engine == "cuneiform":
+                self.submit_to_pool(do_ocr_cuneiform_task, (param_image_file,),
+                                    lambda _result: finish_page(), fail_page)
+            else:
+                self.submit_to_pool(do_ocr_tesseract_task, (param_image_file,),
+                                    lambda _result: finish_page(), fail_page)
+
+        def on_pre_ocr_done(param_image_file, param_probe_info):
+            # The fused worker already ran autorotate info and deskew for non blank pages
+            with pipeline_lock:
+                self.record_probe_result(param_image_file, param_probe_info)
+                is_blank = param_probe_info[1] is not None
+            if is_blank:
+                finish_page()  # Blank pages skip OCR
+            else:
+                enter_ocr_stage(param_image_file)
+
+        pre_ocr_worker = self.build_pre_ocr_worker()
+
+        def on_range_done(param_range_result):
+            return_code, created_images = param_range_result
+            with pipeline_lock:
+                pipeline_state["ranges_pending"] -= 1
+                if return_code != 0:
+                    pipeline_state["render_failed"] = True
+                pipeline_state["pages_in_flight"] += len(created_images)
+                check_all_done()
+            for t_image in created_images:
+                self.submit_to_pool(pre_ocr_worker, (t_image,),
+                                    lambda probe_info, t_image_file=t_image: on_pre_ocr_done(t_image_file, probe_info), fail_page)
+
+        def on_range_error(param_error):
+            eprint("Warning: pdftoppm worker error: {0}".format(param_error))
+            with pipeline_lock:
+                pipeline_state["ranges_pending"] -= 1
+                pipeline_state["render_failed"] = True
+                check_all_done()
+
+        for page_range in parallel_page_ranges:
+            self.submit_to_pool(do_pdftoimage,
+                                (self.path_pdftoppm, page_range, input_file_for_images, self.image_resolution,
+                                 self.tmp_dir, self.prefix, self.extension_images, self.verbose_mode),
+                                on_range_done, on_range_error)
+        while not pipeline_done.is_set() and (self.main_pool is not None):
+            pipeline_done.wait(5)
+            if (not pipeline_done.is_set()) and (self.main_pool is not None):
+                with pipeline_lock:
+                    pages_done = pipeline_state["pages_done"]
+                self.log("Pipeline in progress. {0}/{1} pages completed...".format(pages_done, self.input_file_number_of_pages))
+        if pipeline_state["render_failed"]:
+            self.cleanup()
+            raise Pdf2PdfOcrException("Fail to create images from PDF. Exiting.")
+        return True
 
     def convert_input_to_images(self):
         self.log("Converting input file to images...")
         if self.input_file_type == "application/pdf":
-            input_file_for_images = self.input_file
-            if self.ignore_existing_text:
-                input_file_for_images = self.tmp_dir + "_" + self.prefix + "-input_file_for_images.pdf"
-                # Credits for Kurt Pfeifle: https://stackoverflow.com/questions/24322338/remove-all-text-from-pdf-file
-                p_ignore_text = subprocess.Popen([self.path_gs, "-o", input_file_for_images, "-sDEVICE=pdfwrite", "-dFILTERTEXT", self.input_file],
-                                                 stdout=subprocess.DEVNULL,
-                                                 stderr=open(self.tmp_dir + "err_input_file_for_images-{0}.log".format(self.prefix),
-                                                             "wb"), shell=self.shell_mode)
-                p_ignore_text.wait()
-            #
+            input_file_for_images = self.prepare_input_file_for_images()
             parallel_page_ranges = self.calculate_ranges()
             if parallel_page_ranges is not None:
                 # TODO - try to use method inside this class (encapsulate do_pdftoimage)
-                do_pdftoimage_result_codes = self.main_pool.starmap(do_pdftoimage, zip(itertools.repeat(self.path_pdftoppm),
-                                                                                       parallel_page_ranges,
-                                                                                       itertools.repeat(input_file_for_images),
-                                                                                       itertools.repeat(self.image_resolution),
-                                                                                       itertools.repeat(self.tmp_dir),
-                                                                                       itertools.repeat(self.prefix),
-                                                                                       itertools.repeat(self.shell_mode)))
+                pdftoimage_worker = functools.partial(do_pdftoimage, self.path_pdftoppm,
+                                                      param_input_file=input_file_for_images,
+                                                      param_image_resolution=self.image_resolution,
+                                                      param_tmp_dir=self.tmp_dir,
+                                                      param_prefix=self.prefix,
+                                                      param_image_extension=self.extension_images,
+                                                      param_verbose_mode=self.verbose_mode)
+                pdftoimage_results = self.dispatch_with_progress(pdftoimage_worker, zip(parallel_page_ranges),
+                                                                 "Converting PDF to images. {0}/{1} page ranges completed...")
+                do_pdftoimage_result_codes = [task_future.result()[0] for task_future in pdftoimage_results]
             else:
                 # Without page info, only alternative is going sequentialy (without range)
-                do_pdftoimage_result_code = do_pdftoimage(self.path_pdftoppm, None, input_file_for_images, self.image_resolution, self.tmp_dir,
-                                                          self.prefix, self.shell_mode)
+                do_pdftoimage_result_code, _ = do_pdftoimage(self.path_pdftoppm, None, input_file_for_images, self.image_resolution, self.tmp_dir,
+                                                             self.prefix, self.extension_images, self.verbose_mode)
                 do_pdftoimage_result_codes = [do_pdftoimage_result_code]
             #
             if not all(ret_code == 0 for ret_code in do_pdftoimage_result_codes):
@@ -1133,8 +1770,7 @@ This software is free, but if you like it, please donate to support new features
             if self.input_file_type in ["image/tiff", "image/jpeg", "image/png"]:
                 # %09d to format files for correct sort
                 p = subprocess.Popen([self.path_convert, self.input_file, '-quality', '100', '-scene', '1',
-                                      self.tmp_dir + self.prefix + '-%09d.' + self.extension_images],
-                                     shell=self.shell_mode)
+                                      self.tmp_dir + self.prefix + '-%09d.' + self.extension_images], env=CHILD_ENV)
                 p.wait()
             else:
                 self.cleanup()
@@ -1166,25 +1802,70 @@ This software is free, but if you like it, please donate to support new features
             if self.create_text_mode and os.path.isfile(self.output_file_text):
                 raise Pdf2PdfOcrException("{0} already exists and safe mode is enabled. Exiting.".format(self.output_file_text))
 
-    def validate_pdf_input_file(self):
+    def qpdf_probe(self, param_pdf_file_path):
+        """
+        Page count and encryption status from one native 'qpdf --json' call - no Python
+        page objects are built. Returns None when qpdf is unavailable or the probe fails,
+        and the caller falls back to PyPDF2.
+        """
+        if self.path_qpdf is None:
+            return None
         try:
-            pdf_file_obj = open(self.input_file, 'rb')
-            pdf_reader = PyPDF2.PdfReader(pdf_file_obj, strict=False)
-        except PdfReadError:
-            self.cleanup()
-            raise Pdf2PdfOcrException("Corrupted PDF file detected. Aborting...")
-        #
+            qpdf_json = json.loads(subprocess.check_output(
+                [self.path_qpdf, "--json", "--json-key=pages", "--json-key=encrypt", param_pdf_file_path],
+                stderr=subprocess.DEVNULL))
+            return {"pages": len(qpdf_json["pages"]), "encrypted": bool(qpdf_json["encrypt"]["encrypted"])}
+        except Exception as e_probe:
+            self.debug("qpdf probe failed for '{0}': {1}".format(param_pdf_file_path, e_probe))
+            return None
+
+    def read_input_metadata(self):
+        """Document info dictionary of the input file. pikepdf reads it without parsing pages; PyPDF2 is the fallback."""
         try:
-            self.input_file_number_of_pages = len(pdf_reader.pages)
+            if pikepdf is not None:
+                with pikepdf.open(self.input_file) as pdf_data:
+                    return {str(meta_key): str(meta_value) for meta_key, meta_value in pdf_data.docinfo.items()}
+            with open(self.input_file, 'rb') as pdf_file_obj:
+                return PyPDF2.PdfReader(pdf_file_obj, strict=False).metadata
         except Exception:
-            eprint("Warning: could not read input file number of pages.")
-            self.input_file_number_of_pages = None  # Will be calculated later based on number of image files to process
-        #
-        self.check_avoid_high_pages()
-        #
-        self.input_file_is_encrypted = pdf_reader.is_encrypted
-        if not self.input_file_is_encrypted:
-            self.input_file_metadata = pdf_reader.metadata
+            eprint("Warning: could not read input file metadata.")
+            return dict()
+
+    def validate_pdf_input_file(self):
+        qpdf_info = self.qpdf_probe(self.input_file)
+        if qpdf_info is not None:
+            self.input_file_number_of_pages = qpdf_info["pages"]
+            self.check_avoid_high_pages()
+            self.input_file_is_encrypted = qpdf_info["encrypted"]
+            if not self.input_file_is_encrypted:
+                self.input_file_metadata = self.read_input_metadata()
+        else:
+            try:
+                pdf_file_obj = open(self.input_file, 'rb')
+                pdf_reader = PyPDF2.PdfReader(pdf_file_obj, strict=False)
+            except PdfReadError:
+                self.cleanup()
+                raise Pdf2PdfOcrException("Corrupted PDF file detected. Aborting...")
+            #
+            try:
+                self.input_file_number_of_pages = len(pdf_reader.pages)
+            except Exception:
+                eprint("Warning: could not read input file number of pages.")
+                self.input_file_number_of_pages = None  # Will be calculated later based on number of image files to process
+            #
+            self.check_avoid_high_pages()
+            #
+            self.input_file_is_encrypted = pdf_reader.is_encrypted
+            if not self.input_file_is_encrypted:
+                self.input_file_metadata = pdf_reader.metadata
+            self.input_pdf_reader = pdf_reader
+            #
+            # The reader is already open - stash the first page area so _merge_ocr does not parse the input again
+            try:
+                first_page_rect = pdf_reader.pages[0].mediaBox
+                self.first_page_area_cache[self.input_file] = float(first_page_rect.getWidth() * first_page_rect.getHeight())
+            except Exception:
+                pass  # Geometry stays uncached - get_first_page_area will warn if it cannot be read either
         #
         if self.check_text_mode:
             self.input_file_has_text = self.check_for_text()
@@ -1206,19 +1887,38 @@ This software is free, but if you like it, please donate to support new features
 
     def check_avoid_file_by_size(self):
         if self.avoid_small_file_mode:
-            input_file_size_kb = os.path.getsize(self.input_file) / 1024
-            if input_file_size_kb < self.avoid_small_file_limit_kb:
+            if self.input_file_size_kb < self.avoid_small_file_limit_kb:
                 self.cleanup()
                 raise Pdf2PdfOcrException("Input file has {0:.2f} KBytes and minimum size to process (--min-kbytes) is {1:.2f} KBytes. "
-                                          "Exiting.".format(input_file_size_kb, self.avoid_small_file_limit_kb))
+                                          "Exiting.".format(self.input_file_size_kb, self.avoid_small_file_limit_kb))
 
     def check_for_text(self):
-        """Check if input file contains text. Actually based on pdffonts from poppler"""
-        ptext = subprocess.Popen([self.path_pdffonts, self.input_file], stdout=subprocess.PIPE,
-                                 stderr=subprocess.DEVNULL, shell=self.shell_mode)
-        ptext_output, ptext_errors = ptext.communicate()
-        ptext.wait()
-        pdffonts_text_output_lines = ptext_output.decode("utf-8").strip().splitlines()
+        """
+        Check if input file contains text (i.e. any page declares a font). Inspected
+        in-process with PyPDF2 - one less subprocess per input file. The old pdffonts
+        call from poppler remains the fallback for files PyPDF2 cannot parse.
+        """
+        if not self.input_file_is_encrypted:
+            try:
+                if pikepdf is not None:
+                    # libqpdf parses the page tree in native code - much faster than PyPDF2 on big files
+                    with pikepdf.open(self.input_file) as pdf_data:
+                        return any("/Font" in pdf_page.get("/Resources", {}) for pdf_page in pdf_data.pages)
+                if self.input_pdf_reader is not None:
+                    # validate_pdf_input_file already parsed the file - reuse that reader
+                    pdf_reader = self.input_pdf_reader
+                else:
+                    pdf_reader = PyPDF2.PdfReader(open(self.input_file, 'rb'), strict=False)
+                for pdf_page in pdf_reader.pages:
+                    page_resources = pdf_page.get("/Resources", {})
+                    if "/Font" in page_resources:
+                        return True
+                return False
+            except Exception:
+                self.debug("Could not inspect fonts in-process. Falling back to pdffonts.")
+        ptext = subprocess.run([self.path_pdffonts, self.input_file], stdout=subprocess.PIPE,
+                               stderr=subprocess.DEVNULL, check=False)
+        pdffonts_text_output_lines = ptext.stdout.decode("utf-8").strip().splitlines()
         # Return without fonts has exactly 2 header lines.
         # All return with more than 2 lines should mean we have some font (text) in the file.
         if len(pdffonts_text_output_lines) > 2:
@@ -1226,13 +1926,30 @@ This software is free, but if you like it, please donate to support new features
         else:
             return False
 
+    MAGIC_SIGNATURES = [(b"%PDF", "application/pdf"), (b"\x89PNG", "image/png"), (b"\xff\xd8\xff", "image/jpeg"),
+                        (b"II*\x00", "image/tiff"), (b"MM\x00*", "image/tiff")]
+    """Magic byte signatures of the input types this software handles, checked before forking 'file'"""
+
     def detect_file_type(self):
-        """Detect mime type of input file"""
-        pfile = subprocess.Popen([self.path_file, '-b', '--mime-type', self.input_file], stdout=subprocess.PIPE,
-                                 stderr=subprocess.DEVNULL, shell=self.shell_mode)
-        pfile_output, pfile_errors = pfile.communicate()
-        pfile.wait()
-        self.input_file_type = pfile_output.decode("utf-8").strip()
+        """
+        Detect mime type of input file. The types this software handles are identified by
+        their magic bytes without forking the 'file' binary; anything else still goes
+        through 'file' so unsupported inputs keep their exact reported type.
+        """
+        self.input_file_type = None
+        try:
+            with open(self.input_file, 'rb') as input_file_obj:
+                file_header = input_file_obj.read(8)
+            for signature, mime_type in Pdf2PdfOcr.MAGIC_SIGNATURES:
+                if file_header.startswith(signature):
+                    self.input_file_type = mime_type
+                    break
+        except OSError:
+            pass  # 'file' below will report the problem in its own way
+        if self.input_file_type is None:
+            pfile = subprocess.run([self.path_file, '-b', '--mime-type', self.input_file], stdout=subprocess.PIPE,
+                                   stderr=subprocess.DEVNULL, check=False)
+            self.input_file_type = pfile.stdout.decode("utf-8").strip()
         self.log("Input file {0}: type is {1}".format(self.input_file, self.input_file_type))
 
     def test_convert(self):
@@ -1240,22 +1957,34 @@ This software is free, but if you like it, please donate to support new features
         test convert command to check if it's ImageMagick
         :return: True if it's ImageMagicks convert, false with any other case or error
         """
+        cache_key = (self.path_convert, "is_imagemagick")
+        if cache_key in Pdf2PdfOcr.tool_probe_cache:
+            return Pdf2PdfOcr.tool_probe_cache[cache_key]
+        if self.path_convert is not None:
+            cached_result = get_cached_probe(self.path_convert, "is_imagemagick")
+            if cached_result is not None:
+                Pdf2PdfOcr.tool_probe_cache[cache_key] = cached_result
+                return cached_result
         try:
-            result = False
-            test_image = self.tmp_dir + "converttest-" + self.prefix + ".jpg"
-            ptest = subprocess.Popen([self.path_convert, 'rose:', test_image], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
-                                     shell=self.shell_mode)
-            ptest.wait()
-            return_code = ptest.returncode
-            if (return_code == 0) and (os.path.isfile(test_image)):
-                Pdf2PdfOcr.best_effort_remove(test_image)
-                result = True
+            # Version banner identifies ImageMagick (vs. e.g. the Windows filesystem tool of
+            # the same name) without the old rose: test image encode and disk round-trip
+            ptest = subprocess.run([self.path_convert, '-version'], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=False)
+            result = (ptest.returncode == 0) and (b"ImageMagick" in ptest.stdout)
+            Pdf2PdfOcr.tool_probe_cache[cache_key] = result
+            set_cached_probe(self.path_convert, "is_imagemagick", result)
             return result
         except Exception:
             self.log("Error testing convert utility. Assuming there is no 'convert' available...")
             return False
 
     def test_tesseract_textonly_pdf(self):
+        cache_key = (self.path_tesseract, "textonly_pdf")
+        if cache_key in Pdf2PdfOcr.tool_probe_cache:
+            return Pdf2PdfOcr.tool_probe_cache[cache_key]
+        cached_result = get_cached_probe(self.path_tesseract, "textonly_pdf")
+        if cached_result is not None:
+            Pdf2PdfOcr.tool_probe_cache[cache_key] = cached_result
+            return cached_result
         result = False
         try:
             result = ('textonly_pdf' in subprocess.check_output([self.path_tesseract, '--print-parameters'], universal_newlines=True))
@@ -1263,28 +1992,33 @@ This software is free, but if you like it, please donate to support new features
             self.log("Error checking tesseract capabilities. Trying to continue without 'textonly_pdf' in Tesseract")
         #
         self.debug("Tesseract can 'textonly_pdf': {0}".format(result))
+        Pdf2PdfOcr.tool_probe_cache[cache_key] = result
+        set_cached_probe(self.path_tesseract, "textonly_pdf", result)
         return result
 
     def get_tesseract_version(self):
         # Inspired by the great lib 'pytesseract' - https://github.com/madmaze/pytesseract/blob/master/src/pytesseract.py
+        cache_key = (self.path_tesseract, "version")
+        if cache_key in Pdf2PdfOcr.tool_probe_cache:
+            return Pdf2PdfOcr.tool_probe_cache[cache_key]
         try:
-            version_info = subprocess.check_output([self.path_tesseract, '--version'], stderr=subprocess.STDOUT).decode('utf-8').split()
-            # self.debug("Tesseract full version info: {0}".format(version_info))
-            version_info = version_info[1].lstrip(string.printable[10:])
-            l_version_info = parse_version(version_info)
+            l_version_info = get_tool_version(self.path_tesseract, '--version')
             result = int(l_version_info.base_version.split(".")[0])
             self.debug("Tesseract version: {0}".format(result))
+            Pdf2PdfOcr.tool_probe_cache[cache_key] = result
             return result
         except Exception as e:
             self.log("Error checking tesseract version. Trying to continue assuming legacy version 3. Exception was {0}".format(e))
             return 3
 
     def get_qpdf_version(self):
+        cache_key = (self.path_qpdf, "version")
+        if cache_key in Pdf2PdfOcr.tool_probe_cache:
+            return Pdf2PdfOcr.tool_probe_cache[cache_key]
         try:
-            version_info = subprocess.check_output([self.path_qpdf, '--version'], stderr=subprocess.STDOUT).decode('utf-8').split()
-            version_info = version_info[2]
-            l_version_info = parse_version(version_info)
+            l_version_info = get_tool_version(self.path_qpdf, '--version')
             self.debug("Qpdf version: {0}".format(l_version_info))
+            Pdf2PdfOcr.tool_probe_cache[cache_key] = l_version_info
             return l_version_info
         except Exception as e:
             legacy_version = "8.4.0"
@@ -1292,11 +2026,13 @@ This software is free, but if you like it, please donate to support new features
             return parse_version(legacy_version)
 
     def get_pdftoppm_version(self):
+        cache_key = (self.path_pdftoppm, "version")
+        if cache_key in Pdf2PdfOcr.tool_probe_cache:
+            return Pdf2PdfOcr.tool_probe_cache[cache_key]
         try:
-            version_info = subprocess.check_output([self.path_pdftoppm, '-v'], stderr=subprocess.STDOUT).decode('utf-8').split()
-            version_info = version_info[2]
-            l_version_info = parse_version(version_info)
+            l_version_info = get_tool_version(self.path_pdftoppm, '-v')
             self.debug("Pdftoppm version: {0}".format(l_version_info))
+            Pdf2PdfOcr.tool_probe_cache[cache_key] = l_version_info
             return l_version_info
         except Exception as e:
             legacy_version = "0.70.0"
@@ -1305,58 +2041,44 @@ This software is free, but if you like it, please donate to support new features
 
     def calculate_ranges(self):
         """
-        calculate ranges to run pdftoppm in parallel. Each CPU available will run well defined page range
+        calculate ranges to run pdftoppm in parallel. Small fixed size ranges instead of one
+        range per CPU: completed ranges stream into the pipeline sooner, and a slow page only
+        delays its own small range instead of a whole per-core slice.
         :return:
         """
         if (self.input_file_number_of_pages is None) or (self.input_file_number_of_pages < 20):  # 20 to avoid unnecessary parallel operation
             return None
         #
-        range_size = math.ceil(self.input_file_number_of_pages / self.cpu_to_use)
+        # Cap at 10 pages per range - enough to amortize the per-process PDF open/xref parse,
+        # small enough to keep all cores busy until the very end of the document
+        range_size = min(10, math.ceil(self.input_file_number_of_pages / self.cpu_to_use))
         number_of_ranges = math.ceil(self.input_file_number_of_pages / range_size)
-        result = []
-        for i in range(0, number_of_ranges):
-            range_start = (range_size * i) + 1
-            range_end = (range_size * i) + range_size
-            # Handle last range
-            if range_end > self.input_file_number_of_pages:
-                range_end = self.input_file_number_of_pages
-            result.append((range_start, range_end))
-        # Check result
-        check_pages = 0
-        for created_range in result:
-            check_pages += (created_range[1] - created_range[0]) + 1
-        if check_pages != self.input_file_number_of_pages:
-            raise ArithmeticError("Please check 'calculate_ranges' function, something is wrong...")
-        #
-        return result
+        # array_split covers 1..n exactly by construction, so no verification loop is needed
+        page_chunks = np.array_split(np.arange(1, self.input_file_number_of_pages + 1), number_of_ranges)
+        return [(int(chunk[0]), int(chunk[-1])) for chunk in page_chunks if len(chunk) > 0]
 
     def edit_producer(self):
         self.debug("Editing producer")
         param_source_file = self.tmp_dir + self.prefix + "-OUTPUT-ROTATED.pdf"
-        file_source = open(param_source_file, 'rb')
-        pre_output_pdf = PyPDF2.PdfReader(file_source, strict=False)
-        final_output_pdf = PyPDF2.PdfWriter()
-        for i in range(len(pre_output_pdf.pages)):
-            page = pre_output_pdf.pages[i]
-            final_output_pdf.addPage(page)
         info_dict_output = dict()
         # Our signature as a producer
         our_name = "PDF2PDFOCR(github.com/LeoFCardoso/pdf2pdfocr)"
         read_producer = False
         producer_key = "/Producer"
         if self.input_file_metadata is not None:
+            create_string_object = PyPDF2.generic.createStringObject
             for key in self.input_file_metadata:
                 value = self.input_file_metadata[key]
                 if key == producer_key:
                     if type(value) == ByteStringObject:
                         value = str(value, errors="ignore")
-                        value = "".join(filter(lambda x: x in string.printable, value))  # Try to remove unprintable
+                        value = PRINTABLE_FILTER_PATTERN.sub("", value)  # Try to remove unprintable
                     value = value + "; " + our_name
                     read_producer = True
                 #
                 try:
                     # Check if value can be accepted by pypdf API
-                    PyPDF2.generic.createStringObject(value)
+                    create_string_object(value)
                     info_dict_output[key] = value
                 except TypeError:
                     # This can happen with some array properties.
@@ -1365,11 +2087,28 @@ This software is free, but if you like it, please donate to support new features
         if not read_producer:
             info_dict_output[producer_key] = our_name
         #
+        if pikepdf is not None:
+            try:
+                # libqpdf patches the info dictionary and reserializes in native code -
+                # no Python page objects are built for a one string metadata change
+                with pikepdf.open(param_source_file) as pdf_data:
+                    for key, value in info_dict_output.items():
+                        pdf_data.docinfo[key] = value
+                    pdf_data.save(self.output_file)
+                return
+            except Exception:
+                eprint("Warning: could not edit producer with pikepdf. Using fallback.")
+        #
+        file_source = open(param_source_file, 'rb')
+        pre_output_pdf = PyPDF2.PdfReader(file_source, strict=False)
+        final_output_pdf = PyPDF2.PdfWriter()
+        # Bulk page tree copy instead of per-page addPage round trips
+        final_output_pdf.append_pages_from_reader(pre_output_pdf)
         final_output_pdf.add_metadata(info_dict_output)
         #
-        with open(self.output_file, 'wb') as f:
+        # 1 MB buffer - PyPDF2 emits many tiny writes for a whole document
+        with open(self.output_file, 'wb', buffering=1 << 20) as f:
             final_output_pdf.write(f)
-            f.close()
         #
         file_source.close()
 
@@ -1386,10 +2125,85 @@ This software is free, but if you like it, please donate to support new features
 # noinspection PyUnusedLocal,PyUnusedLocal
 def sigint_handler(signum, frame):
     global pdf2ocr
-    pdf2ocr.cleanup()
+    try:
+        pdf2ocr.cleanup()
+    except NameError:
+        pass  # Dir mode parent: the instances live in the outer pool workers, which clean up themselves
     sys.exit(1)
 
 
+def iter_files(param_root_dir):
+    """
+    Recursively yield all files under a directory. scandir reuses the dirent type
+    information, so no extra stat call is paid per entry (os.walk builds full lists
+    per directory before yielding anything). Symlinked files are yielded (os.walk
+    listed them too); only the directory recursion refuses to follow links.
+    """
+    with os.scandir(param_root_dir) as dir_entries:
+        for dir_entry in dir_entries:
+            if dir_entry.is_dir(follow_symlinks=False):
+                yield from iter_files(dir_entry.path)
+            elif dir_entry.is_file():
+                yield dir_entry.path
+
+
+def do_process_file(param_args, param_file_to_process, param_cpu_to_use=None):
+    """
+    Process one input file end to end, honoring the optional timeout. Returns True on
+    success. In dir mode this also runs as an outer pool worker, with param_cpu_to_use
+    throttling the inner pool so the total worker count stays near the CPU budget.
+    """
+    global pdf2ocr
+    try:
+        print("-------------------------------------")
+        print("File:", param_file_to_process, flush=True)
+        pdf2ocr = Pdf2PdfOcr(param_args, param_file_to_process, override_cpu_to_use=param_cpu_to_use)
+        #
+        if param_args.timeout:
+            if hasattr(signal, "setitimer"):
+                # POSIX: an interval timer interrupts the OCR in place - no extra thread,
+                # and the run can be stopped cleanly instead of abandoning a worker thread
+
+                # noinspection PyUnusedLocal
+                def timeout_alarm_handler(signum, frame):
+                    raise TimeoutError()
+
+                previous_alarm_handler = signal.signal(signal.SIGALRM, timeout_alarm_handler)
+                signal.setitimer(signal.ITIMER_REAL, param_args.timeout)
+                try:
+                    pdf2ocr.ocr()
+                except TimeoutError:
+                    pdf2ocr.cleanup()
+                    raise Pdf2PdfOcrException("Script stopped due to timeout of {0} seconds".format(param_args.timeout))
+                finally:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+                    signal.signal(signal.SIGALRM, previous_alarm_handler)
+            else:
+                # https://stackoverflow.com/questions/56305195/is-it-possible-to-specify-the-max-amount-of-time-to-wait-for-code-to-run-with-py
+                # /56305465
+                with futures.ThreadPoolExecutor(max_workers=1) as executor:
+                    future_pdf2ocr = executor.submit(pdf2ocr.ocr)
+                    try:
+                        future_pdf2ocr.result(param_args.timeout)
+                    except futures.TimeoutError as fte:
+                        #
+                        # https://stackoverflow.com/questions/48350257/how-to-exit-a-script-after-threadpoolexecutor-has-timed-out
+                        import atexit
+
+                        # noinspection PyProtectedMember
+                        atexit.unregister(futures.thread._python_exit)
+                        executor.shutdown = lambda wait: None
+                        #
+                        pdf2ocr.cleanup()
+                        raise Pdf2PdfOcrException("Script stopped due to timeout of {0} seconds".format(param_args.timeout))
+        else:
+            pdf2ocr.ocr()
+        return True
+    except Pdf2PdfOcrException as e_p:
+        print("Error:", e_p, flush=True)
+        return False
+
+
 # -------------
 # MAIN
 # -------------
@@ -1402,12 +2216,9 @@ if __name__ == '__main__':
     # "If the tesseract executable was built with multithreading support, it will normally use four CPU cores for the OCR process. While this can be
     # faster for a single image, it gives bad performance if the host computer provides less than four CPU cores or if OCR is made for many images.
     # Only a single CPU core is used with OMP_THREAD_LIMIT=1"
-    # As we control number of parallel executions, set this env var for the entire script.
-    os.environ['OMP_THREAD_LIMIT'] = '1'
-    #
-    # Adjust Imagemagick parallel control
-    # https://legacy.imagemagick.org/script/resources.php
-    os.environ['MAGICK_THREAD_LIMIT'] = '1'
+    # As we control number of parallel executions, the limit is applied via CHILD_ENV on
+    # every tesseract/ImageMagick spawn (https://legacy.imagemagick.org/script/resources.php
+    # for the ImageMagick side) instead of mutating this process environment.
     #
     # Arguments
     parser = argparse.ArgumentParser(
@@ -1492,45 +2303,28 @@ Examples:
     #
     dir_mode = os.path.isdir(pdf2ocr_args.input_file)
     if dir_mode:
-        file_to_process_list = []
-        for t_root, t_directories, t_files in os.walk(pdf2ocr_args.input_file):
-            for name in t_files:
-                file_to_process_list.append(os.path.join(t_root, name))
+        file_to_process_list = list(iter_files(pdf2ocr_args.input_file))
     else:
         file_to_process_list = [pdf2ocr_args.input_file]
     #
     signal.signal(signal.SIGINT, sigint_handler)
     #
-    all_success = True
-    for file_to_process in file_to_process_list:
-        try:
-            print("-------------------------------------")
-            print("File:", file_to_process, flush=True)
-            pdf2ocr = Pdf2PdfOcr(pdf2ocr_args, file_to_process)
-            #
-            if pdf2ocr_args.timeout:
-                # https://stackoverflow.com/questions/56305195/is-it-possible-to-specify-the-max-amount-of-time-to-wait-for-code-to-run-with-py
-                # /56305465
-                with futures.ThreadPoolExecutor(max_workers=1) as executor:
-                    future_pdf2ocr = executor.submit(pdf2ocr.ocr)
-                    try:
-                        future_pdf2ocr.result(pdf2ocr_args.timeout)
-                    except futures.TimeoutError as fte:
-                        #
-                        # https://stackoverflow.com/questions/48350257/how-to-exit-a-script-after-threadpoolexecutor-has-timed-out
-                        import atexit
-
-                        # noinspection PyProtectedMember
-                        atexit.unregister(futures.thread._python_exit)
-                        executor.shutdown = lambda wait: None
-                        #
-                        pdf2ocr.cleanup()
-                        raise Pdf2PdfOcrException("Script stopped due to timeout of {0} seconds".format(pdf2ocr_args.timeout))
-            else:
-                pdf2ocr.ocr()
-        except Pdf2PdfOcrException as e_p:
-            print("Error:", e_p, flush=True)
-            all_success = False
+    cpu_budget = int(multiprocessing.cpu_count() * (pdf2ocr_args.parallel_percent if pdf2ocr_args.parallel_percent else 1))
+    if cpu_budget == 0:
+        cpu_budget = 1
+    outer_workers = min(len(file_to_process_list), cpu_budget)
+    if outer_workers > 1:
+        # Dir mode with several files: process files concurrently, each instance using a
+        # slice of the CPU budget, so cores stay busy during per-file setup and teardown
+        inner_cpu_to_use = max(1, cpu_budget // outer_workers)
+        file_worker = functools.partial(do_process_file, pdf2ocr_args, param_cpu_to_use=inner_cpu_to_use)
+        with futures.ProcessPoolExecutor(max_workers=outer_workers) as outer_pool:
+            all_success = all(list(outer_pool.map(file_worker, file_to_process_list)))
+    else:
+        # Single file (or single worker): direct call, no outer subprocess
+        all_success = True
+        for file_to_process in file_to_process_list:
+            all_success = do_process_file(pdf2ocr_args, file_to_process) and all_success
     #
     if pdf2ocr_args.pause_end_mode:
         input("Press <Enter> to continue...")
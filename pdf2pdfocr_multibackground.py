@@ -31,65 +31,76 @@ def debug(param):
         pass
 
 
-output = PdfFileWriter()
-# First file (image)
-imagepdf = PdfFileReader(open(sys.argv[1], 'rb'), strict=False)
-# Second file (text)
-textpdf = PdfFileReader(open(sys.argv[2], 'rb'), strict=False)
-# Copy pages to output with text
-scale_tolerance = 0.001
-for i in range(imagepdf.getNumPages()):
-    debug("Page: {0}".format(i + 1))
-    imagepage = imagepdf.getPage(i)
-    textpage = textpdf.getPage(i)
-    debug("Img (original): {0}".format(imagepage.mediaBox.upperRight))
-    debug("Text: {0}".format(textpage.mediaBox.upperRight))
-    # Handle rotation
-    rotate_angle = imagepage.get('/Rotate')
-    debug("Image page rotate angle is {0}".format(rotate_angle))
-    debug("Text page rotate angle is {0}".format(textpage.get('/Rotate')))
-    if rotate_angle is None:
-        rotate_angle = 0
+def merge(image_pdf_path, text_pdf_path, output_pdf_path):
+    """
+    Merge the image (foreground) PDF over the text (background) PDF, page by page,
+    into output_pdf_path. Importable so pdf2pdfocr can run the merge in-process
+    instead of paying a fresh interpreter startup per call.
+    """
+    output = PdfFileWriter()
+    # First file (image)
+    imagepdf = PdfFileReader(open(image_pdf_path, 'rb'), strict=False)
+    # Second file (text)
+    textpdf = PdfFileReader(open(text_pdf_path, 'rb'), strict=False)
+    # Copy pages to output with text
+    scale_tolerance = 0.001
+    for i in range(imagepdf.getNumPages()):
+        debug("Page: {0}".format(i + 1))
+        imagepage = imagepdf.getPage(i)
+        textpage = textpdf.getPage(i)
+        debug("Img (original): {0}".format(imagepage.mediaBox.upperRight))
+        debug("Text: {0}".format(textpage.mediaBox.upperRight))
+        # Handle rotation
+        rotate_angle = imagepage.get('/Rotate')
+        debug("Image page rotate angle is {0}".format(rotate_angle))
+        debug("Text page rotate angle is {0}".format(textpage.get('/Rotate')))
+        if rotate_angle is None:
+            rotate_angle = 0
+        #
+        image_page_x = imagepage.mediaBox.upperRight[0]
+        image_page_y = imagepage.mediaBox.upperRight[1]
+        # With rotated pages (90 or 270 degress), we have to switch x and y, to avoid wrong scale operation
+        if rotate_angle == 90 or rotate_angle == 270:
+            image_page_x = imagepage.mediaBox.upperRight[1]
+            image_page_y = imagepage.mediaBox.upperRight[0]
+        #
+        debug("Img (dimensions after rotation): {0}, {1}".format(image_page_x, image_page_y))
+        factor_x = textpage.mediaBox.upperRight[0] / image_page_x
+        factor_y = textpage.mediaBox.upperRight[1] / image_page_y
+        debug("Factors: {0}, {1}".format(factor_x, factor_y))
+        debug("Corrected Factors: {0}, {1}".format(factor_x - 1, factor_y - 1))
+        # Try to avoid unnecessary scale operation
+        if abs(factor_x - 1) > scale_tolerance or abs(factor_y - 1) > scale_tolerance:
+            debug("Scaling...")
+            imagepage.scale(float(factor_x), float(factor_y))
+        # imagepage stay on top
+        if rotate_angle == 0 or rotate_angle == 360:
+            debug("Merge simple")
+            # TODO very slow in some PDFs
+            textpage.mergePage(imagepage)
+        else:
+            debug("Merge rotated")
+            # Tested values for translation with 90 degrees
+            if rotate_angle == 90:
+                textpage.mergeRotatedTranslatedPage(imagepage, (-1 * rotate_angle), image_page_y / 2,
+                                                    image_page_y / 2, expand=False)
+            # Tested values for translation with 180 degrees
+            if rotate_angle == 180:
+                textpage.mergeRotatedTranslatedPage(imagepage, (-1 * rotate_angle), image_page_x / 2,
+                                                    image_page_y / 2, expand=False)
+            # Tested values for translation with 270 degrees
+            if rotate_angle == 270:
+                textpage.mergeRotatedTranslatedPage(imagepage, (-1 * rotate_angle), image_page_x / 2,
+                                                    image_page_x / 2, expand=False)
+        #
+        textpage.compressContentStreams()
+        output.addPage(textpage)
     #
-    image_page_x = imagepage.mediaBox.upperRight[0]
-    image_page_y = imagepage.mediaBox.upperRight[1]
-    # With rotated pages (90 or 270 degress), we have to switch x and y, to avoid wrong scale operation
-    if rotate_angle == 90 or rotate_angle == 270:
-        image_page_x = imagepage.mediaBox.upperRight[1]
-        image_page_y = imagepage.mediaBox.upperRight[0]
+    # 1 MB buffer - PyPDF2 emits many tiny writes for a whole document
+    with open(output_pdf_path, 'wb', buffering=1 << 20) as f:
+        output.write(f)
     #
-    debug("Img (dimensions after rotation): {0}, {1}".format(image_page_x, image_page_y))
-    factor_x = textpage.mediaBox.upperRight[0] / image_page_x
-    factor_y = textpage.mediaBox.upperRight[1] / image_page_y
-    debug("Factors: {0}, {1}".format(factor_x, factor_y))
-    debug("Corrected Factors: {0}, {1}".format(factor_x - 1, factor_y - 1))
-    # Try to avoid unnecessary scale operation
-    if abs(factor_x - 1) > scale_tolerance or abs(factor_y - 1) > scale_tolerance:
-        debug("Scaling...")
-        imagepage.scale(float(factor_x), float(factor_y))
-    # imagepage stay on top
-    if rotate_angle == 0 or rotate_angle == 360:
-        debug("Merge simple")
-        # TODO very slow in some PDFs
-        textpage.mergePage(imagepage)
-    else:
-        debug("Merge rotated")
-        # Tested values for translation with 90 degrees
-        if rotate_angle == 90:
-            textpage.mergeRotatedTranslatedPage(imagepage, (-1 * rotate_angle), image_page_y / 2,
-                                                image_page_y / 2, expand=False)
-        # Tested values for translation with 180 degrees
-        if rotate_angle == 180:
-            textpage.mergeRotatedTranslatedPage(imagepage, (-1 * rotate_angle), image_page_x / 2,
-                                                image_page_y / 2, expand=False)
-        # Tested values for translation with 270 degrees
-        if rotate_angle == 270:
-            textpage.mergeRotatedTranslatedPage(imagepage, (-1 * rotate_angle), image_page_x / 2,
-                                                image_page_x / 2, expand=False)
-    #
-    textpage.compressContentStreams()
-    output.addPage(textpage)
-#
-with open(sys.argv[3], 'wb') as f:
-    output.write(f)
-#
+
+
+if __name__ == '__main__':
+    merge(sys.argv[1], sys.argv[2], sys.argv[3])